@@ -19,26 +19,180 @@ Version: 1.0.0
 
 import json
 import os
+import time
 import boto3
+import botocore.config
+import hashlib
+import io
 import logging
+import threading
+import uuid
+from array import array
+from collections import OrderedDict
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Shared client configuration: the connection pool must cover the parallel
+# chapter workers, and keepalive lets warm containers reuse TLS connections.
+CLIENT_CONFIG = botocore.config.Config(
+    max_pool_connections=32,
+    retries={'max_attempts': 4, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Bedrock gets a larger adaptive retry budget so ThrottlingException under
+# on-demand TPM quotas is absorbed with client-side rate limiting
+BEDROCK_CLIENT_CONFIG = CLIENT_CONFIG.merge(botocore.config.Config(
+    retries={'max_attempts': 5, 'mode': 'adaptive'}
+))
+
 # Initialize AWS clients
 bedrock_runtime = boto3.client(
     service_name='bedrock-runtime',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=BEDROCK_CLIENT_CONFIG
+)
+
+# Pin S3 to the function's region (BOOKS_BUCKET must live there) so requests
+# go straight to the regional endpoint instead of redirecting
+s3_client = boto3.client(
+    's3',
+    region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+    config=CLIENT_CONFIG.merge(botocore.config.Config(s3={'addressing_style': 'virtual'}))
+)
+
+# Lambda client used to hand accepted async requests to a background run
+lambda_client = boto3.client('lambda')
+
+# Bedrock control-plane client, used only for batch inference jobs
+bedrock_client = boto3.client(
+    service_name='bedrock',
     region_name=os.environ.get('AWS_REGION', 'us-east-1')
 )
 
-s3_client = boto3.client('s3')
+# Semantic cache of completions; disabled unless a DynamoDB table is configured.
+# A low-level client is used because the chapter workers share it, and boto3
+# clients (unlike resources) are thread-safe.
+SEMANTIC_CACHE_TABLE = os.environ.get('SEMANTIC_CACHE_TABLE', '')
+semantic_cache = (
+    boto3.client(
+        'dynamodb',
+        region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+        config=CLIENT_CONFIG
+    )
+    if SEMANTIC_CACHE_TABLE else None
+)
 
 # Configuration
 S3_BUCKET = os.environ.get('BOOKS_BUCKET', 'ai-generated-books')
+# Either a base model ID or, for sustained load, a provisioned throughput /
+# inference profile ARN; Bedrock accepts both as modelId
 BEDROCK_MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-v2')
+MAX_PARALLEL_CHAPTERS = int(os.environ.get('MAX_PARALLEL_CHAPTERS', '16'))
+
+# Write the JSON book to a second ".dup" key that readers can fall back to
+DOUBLE_WRITE_ENABLED = os.environ.get('BOOKS_DOUBLE_WRITE', 'false').lower() == 'true'
+
+# IAM role Bedrock assumes to read batch input from and write output to S3
+BEDROCK_BATCH_ROLE_ARN = os.environ.get('BEDROCK_BATCH_ROLE_ARN', '')
+BATCH_PREFIX = 'bedrock-batch'
+BATCH_MIN_RECORDS = 100  # Bedrock's default minimum records per batch job
+JOBS_PREFIX = 'jobs'
+
+EMBEDDING_MODEL_ID = os.environ.get('EMBEDDING_MODEL_ID', 'amazon.titan-embed-text-v2:0')
+EMBEDDING_DIMENSIONS = 256  # Smallest Titan v2 size; keeps the similarity loop cheap
+SEMANTIC_CACHE_THRESHOLD = 0.95  # Cosine similarity required for a cache hit
+SEMANTIC_CACHE_TTL = 7 * 24 * 3600  # 7 days
+SEMANTIC_CACHE_MAX_ITEMS = 200  # Newest entries compared per lookup
+
+# Exact-match completions kept in memory for the life of a warm container
+COMPLETION_CACHE_SIZE = 256
+_completion_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_completion_cache_lock = threading.Lock()
+
+# Bodies above this size are uploaded as parallel multipart uploads
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+    use_threads=True
+)
+
+# Single-pass slug translation for S3 keys: separators become hyphens,
+# quotes, commas and control characters are dropped
+SLUG_TABLE = str.maketrans({
+    ' ': '-', '/': '-', ':': '-', ',': None, "'": None, '"': None
+}) | {code: None for code in range(0x20)}
+
+# API Gateway response headers, shared by every response
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS'
+}
+
+# Plain-text book layout
+TEXT_WIDTH = 70
+RULE_HEAVY = "=" * TEXT_WIDTH
+RULE_LIGHT = "-" * TEXT_WIDTH
+
+# Prompt templates, filled with %-formatting per call
+INTRO_PROMPT_TPL = """Write a compelling introduction for a comprehensive guide about %(topic)s.
+
+The introduction should:
+1. Capture reader interest with a strong opening
+2. Explain why %(topic)s is important and relevant
+3. Outline what readers will learn from this guide
+4. Set expectations for the depth and breadth of coverage
+
+Write 3-4 paragraphs in a professional yet accessible tone."""
+
+CHAPTER_PROMPT_TPL = """Expand the following research insight into a comprehensive book chapter.
+
+Topic: %(topic)s
+Chapter Title: %(title)s
+Research Content: %(content)s
+
+Create a detailed chapter that:
+1. Opens with context and relevance
+2. Expands on key points with explanations
+3. Includes practical examples where appropriate
+4. Maintains a professional yet accessible tone
+5. Concludes with key takeaways
+
+Write 4-6 paragraphs. Be informative and engaging."""
+
+CONCLUSION_PROMPT_TPL = """Write a comprehensive conclusion for a guide about %(topic)s.
+
+The guide covered these topics:
+%(sections)s
+
+The conclusion should:
+1. Synthesize key insights from throughout the guide
+2. Emphasize the most important takeaways
+3. Provide forward-looking perspective
+4. End with actionable recommendations
+
+Write 3-4 paragraphs that bring the guide to a strong close."""
+
+# Completion budgets per prompt type; intro/conclusion ask for 3-4 paragraphs
+INTRO_MAX_TOKENS = 500
+CHAPTER_MAX_TOKENS = 900
+CONCLUSION_MAX_TOKENS = 500
+DEFAULT_MAX_TOKENS = 800
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -54,13 +208,32 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 "topic": "Book topic",
                 "research_data": [...],  # Research insights
                 "book_title": "Optional custom title",
-                "user_id": "user_identifier"
+                "user_id": "user_identifier",
+                "batch_mode": false,  # Submit as a Bedrock batch job
+                "async_mode": false,  # Accept with 202 and generate in background
+                "no_cache": false  # Bypass the completion caches
             }
+            A follow-up request with {"batch_job_arn": "..."} assembles
+            and stores the book once the batch job has completed.
+            {"warmup": true} returns at once without generating anything.
+            With "inline_body": true the response body is an object rather
+            than a JSON string (for direct invocations, not API Gateway).
         context: Lambda context object
     
     Returns:
         API Gateway response with book metadata and S3 location
     """
+    # Keep-warm pings from the orchestrator only need the container initialized
+    if event.get('warmup'):
+        return create_response(200, {'warmup': True})
+    
+    # Set when this invocation is the background run of an async request
+    async_job_id = event.get('async_job_id')
+    
+    # Direct invocations (the orchestrator) can take the body as an object,
+    # so the runtime encodes the response once instead of nesting a string
+    inline = bool(event.get('inline_body'))
+    
     try:
         logger.info("Processing book generation request")
         
@@ -70,6 +243,10 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         else:
             body = event
         
+        # Assemble a previously submitted batch job
+        if body.get('batch_job_arn'):
+            return handle_batch_assembly(body['batch_job_arn'])
+        
         topic = body.get('topic', '').strip()
         research_data = body.get('research_data', [])
         book_title = body.get('book_title', f"Comprehensive Guide to {topic}")
@@ -79,39 +256,141 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not topic or not research_data:
             return create_response(400, {
                 'error': 'Topic and research data are required'
-            })
+            }, inline=inline)
+        
+        # Non-interactive jobs go through Bedrock batch inference
+        if body.get('batch_mode'):
+            # One record per research chapter plus introduction and conclusion
+            if len(research_data) + 2 < BATCH_MIN_RECORDS:
+                return create_response(400, {
+                    'error': f'Batch mode needs at least {BATCH_MIN_RECORDS} chapter '
+                             f'records ({BATCH_MIN_RECORDS - 2} research items); '
+                             f'got {len(research_data) + 2}'
+                }, inline=inline)
+            logger.info(f"Submitting batch job for book: {book_title}")
+            job = submit_book_batch_job(topic, research_data, book_title, user_id)
+            return create_response(202, job, inline=inline)
+        
+        # Return immediately and generate in a background invocation so long
+        # books don't exceed the API Gateway timeout
+        if body.get('async_mode') and not async_job_id:
+            return create_response(202, submit_async_job(body), inline=inline)
+        
+        # Completion cache entries are scoped per user
+        cache_namespace = None if body.get('no_cache') else user_id
+        
+        # One timestamp for the book metadata, S3 keys and response
+        now = datetime.utcnow()
         
         # Generate book structure
         logger.info(f"Generating book: {book_title}")
-        book_content = generate_book(topic, research_data, book_title)
+        book_content = generate_book(
+            topic, research_data, book_title,
+            cache_namespace=cache_namespace, timestamp=now
+        )
         
         # Store book in S3
-        s3_keys = store_book_in_s3(book_content, user_id)
+        s3_keys = store_book_in_s3(book_content, user_id, now)
         
         # Prepare response
-        response_data = {
-            'book_title': book_title,
-            'topic': topic,
-            'chapters': len(book_content['chapters']),
-            'word_count': book_content['word_count'],
-            'average_confidence': book_content['average_confidence'],
-            's3_text_key': s3_keys['text'],
-            's3_json_key': s3_keys['json'],
-            'timestamp': datetime.utcnow().isoformat()
-        }
+        response_data = build_book_summary(book_content, s3_keys)
+        
+        if async_job_id:
+            write_job_status(async_job_id, 'completed', response_data)
         
         logger.info(f"Book generation completed: {book_title}")
-        return create_response(200, response_data)
+        return create_response(200, response_data, inline=inline)
         
     except Exception as e:
         logger.error(f"Book generation error: {str(e)}", exc_info=True)
+        if async_job_id:
+            write_job_status(async_job_id, 'failed', {'message': str(e)})
         return create_response(500, {
             'error': 'Book generation failed',
             'message': str(e)
-        })
+        }, inline=inline)
 
 
-def generate_book(topic: str, research_data: List[Dict], title: str) -> Dict[str, Any]:
+def submit_async_job(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Accept a book request for background generation.
+    
+    Records a pending job in S3 and re-invokes this function asynchronously
+    (InvocationType=Event) with the request. Clients poll the job status
+    object, which is updated to completed or failed by the background run.
+    
+    Args:
+        body: Validated request body
+    
+    Returns:
+        Job metadata for the 202 response
+    """
+    job_id = uuid.uuid4().hex
+    status_key = write_job_status(job_id, 'pending')
+    
+    payload = {key: value for key, value in body.items() if key != 'async_mode'}
+    payload['async_job_id'] = job_id
+    
+    lambda_client.invoke(
+        FunctionName=os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'book-generator'),
+        InvocationType='Event',
+        Payload=json_dumps(payload)
+    )
+    
+    logger.info(f"Accepted async book job: {job_id}")
+    
+    return {
+        'job_id': job_id,
+        'status': 'pending',
+        'status_bucket': S3_BUCKET,
+        'status_key': status_key
+    }
+
+
+def write_job_status(
+    job_id: str,
+    status: str,
+    result: Optional[Dict[str, Any]] = None
+) -> str:
+    """Write the status object for an async job and return its S3 key."""
+    status_key = f"{JOBS_PREFIX}/{job_id}.json"
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=status_key,
+        Body=json_dumps({
+            'job_id': job_id,
+            'status': status,
+            'result': result or {},
+            'updated_at': datetime.utcnow().isoformat()
+        }),
+        ContentType='application/json'
+    )
+    return status_key
+
+
+def build_book_summary(book_content: Dict[str, Any], s3_keys: Dict[str, str]) -> Dict[str, Any]:
+    """Build the API response payload describing a stored book."""
+    return {
+        'book_title': book_content['title'],
+        'topic': book_content['topic'],
+        'chapters': len(book_content['chapters']),
+        'word_count': book_content['word_count'],
+        'average_confidence': book_content['average_confidence'],
+        's3_text_key': s3_keys['text'],
+        's3_json_key': s3_keys['json'],
+        's3_json_backup_key': s3_keys.get('json_backup', ''),
+        'timestamp': book_content['timestamp']
+    }
+
+
+def generate_book(
+    topic: str,
+    research_data: List[Dict],
+    title: str,
+    completions: Optional[Dict[int, str]] = None,
+    cache_namespace: Optional[str] = None,
+    timestamp: Optional[datetime] = None
+) -> Dict[str, Any]:
     """
     Generate complete book content from research data.
     
@@ -127,26 +406,63 @@ def generate_book(topic: str, research_data: List[Dict], title: str) -> Dict[str
         topic: Main topic of the book
         research_data: List of research insights with sections and details
         title: Book title
+        completions: Optional pre-generated chapter text keyed by chapter
+            number (e.g. batch inference output); missing chapters are
+            generated live
+        cache_namespace: Completion cache namespace, or None to disable caching
+        timestamp: Generation time recorded in the book (defaults to now)
     
     Returns:
         Dictionary containing complete book structure with content
     """
     logger.info(f"Generating book structure for: {title}")
     
+    completions = completions or {}
+    conclusion_number = len(research_data) + 2
+    
     # Initialize book structure
     book = {
         'title': title,
         'topic': topic,
         'author': 'AI Research Assistant',
-        'timestamp': datetime.utcnow().isoformat(),
+        'timestamp': (timestamp or datetime.utcnow()).isoformat(),
         'chapters': [],
         'table_of_contents': [],
         'word_count': 0,
         'average_confidence': 0
     }
     
-    # Generate Introduction
-    intro_chapter = generate_introduction(topic, research_data)
+    # Generate introduction, research chapters and conclusion concurrently.
+    # Each call is dominated by the Bedrock round-trip, and every generator
+    # handles its own fallback, so one failed chapter never aborts the book.
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_CHAPTERS) as executor:
+        intro_future = executor.submit(
+            generate_introduction, topic, research_data, completions.get(1),
+            cache_namespace
+        )
+        chapter_futures = [
+            executor.submit(
+                generate_chapter,
+                chapter_number=chapter_number,
+                title=research_item.get('section', ''),
+                research_content=research_item.get('details', ''),
+                topic=topic,
+                base_confidence=research_item.get('confidence', 80),
+                completion=completions.get(chapter_number),
+                cache_namespace=cache_namespace
+            )
+            for chapter_number, research_item in enumerate(research_data, start=2)
+        ]
+        conclusion_future = executor.submit(
+            generate_conclusion, topic, research_data, completions.get(conclusion_number),
+            cache_namespace
+        )
+        
+        intro_chapter = intro_future.result()
+        chapters = [future.result() for future in chapter_futures]
+        conclusion_chapter = conclusion_future.result()
+    
+    # Assemble chapters in reading order
     book['chapters'].append(intro_chapter)
     book['table_of_contents'].append({
         'chapter_number': 1,
@@ -154,38 +470,19 @@ def generate_book(topic: str, research_data: List[Dict], title: str) -> Dict[str
         'page': 1
     })
     
-    # Generate chapters from research sections
-    chapter_number = 2
-    for research_item in research_data:
-        section_name = research_item.get('section', '')
-        section_details = research_item.get('details', '')
-        confidence = research_item.get('confidence', 80)
-        
-        # Generate expanded chapter content
-        chapter = generate_chapter(
-            chapter_number=chapter_number,
-            title=section_name,
-            research_content=section_details,
-            topic=topic,
-            base_confidence=confidence
-        )
-        
+    for chapter in chapters:
         book['chapters'].append(chapter)
         book['table_of_contents'].append({
-            'chapter_number': chapter_number,
-            'title': section_name,
-            'page': chapter_number
+            'chapter_number': chapter['chapter_number'],
+            'title': chapter['title'],
+            'page': chapter['chapter_number']
         })
-        
-        chapter_number += 1
     
-    # Generate Conclusion
-    conclusion_chapter = generate_conclusion(topic, research_data)
     book['chapters'].append(conclusion_chapter)
     book['table_of_contents'].append({
-        'chapter_number': chapter_number,
+        'chapter_number': conclusion_number,
         'title': 'Conclusion',
-        'page': chapter_number
+        'page': conclusion_number
     })
     
     # Calculate metadata
@@ -205,7 +502,12 @@ def generate_book(topic: str, research_data: List[Dict], title: str) -> Dict[str
     return book
 
 
-def generate_introduction(topic: str, research_data: List[Dict]) -> Dict[str, Any]:
+def generate_introduction(
+    topic: str,
+    research_data: List[Dict],
+    completion: Optional[str] = None,
+    cache_namespace: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Generate introduction chapter using AI.
     
@@ -215,24 +517,18 @@ def generate_introduction(topic: str, research_data: List[Dict]) -> Dict[str, An
     Args:
         topic: Main topic
         research_data: Research insights to reference
+        completion: Pre-generated text; Bedrock is called when omitted
+        cache_namespace: Completion cache namespace, or None to disable caching
     
     Returns:
         Chapter dictionary with introduction content
     """
     try:
-        # Create prompt for introduction
-        prompt = f"""Write a compelling introduction for a comprehensive guide about {topic}.
-
-The introduction should:
-1. Capture reader interest with a strong opening
-2. Explain why {topic} is important and relevant
-3. Outline what readers will learn from this guide
-4. Set expectations for the depth and breadth of coverage
-
-Write 3-4 paragraphs in a professional yet accessible tone."""
-
         # Generate content
-        content = generate_with_bedrock(prompt)
+        content = completion or generate_with_bedrock_cached(
+            build_introduction_prompt(topic), 'introduction', topic,
+            cache_namespace, INTRO_MAX_TOKENS
+        )
         
         # Calculate word count
         word_count = len(content.split())
@@ -242,7 +538,7 @@ Write 3-4 paragraphs in a professional yet accessible tone."""
             'title': 'Introduction',
             'content': content,
             'word_count': word_count,
-            'confidence': calculate_chapter_confidence(content),
+            'confidence': calculate_chapter_confidence(content, word_count=word_count),
             'sections': []
         }
         
@@ -265,7 +561,9 @@ def generate_chapter(
     title: str,
     research_content: str,
     topic: str,
-    base_confidence: int
+    base_confidence: int,
+    completion: Optional[str] = None,
+    cache_namespace: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Generate expanded chapter content from research insights.
@@ -279,33 +577,22 @@ def generate_chapter(
         research_content: Base research content to expand
         topic: Main topic for context
         base_confidence: Base confidence score from research
+        completion: Pre-generated text; Bedrock is called when omitted
+        cache_namespace: Completion cache namespace, or None to disable caching
     
     Returns:
         Chapter dictionary with expanded content
     """
     try:
-        # Create prompt for chapter expansion
-        prompt = f"""Expand the following research insight into a comprehensive book chapter.
-
-Topic: {topic}
-Chapter Title: {title}
-Research Content: {research_content}
-
-Create a detailed chapter that:
-1. Opens with context and relevance
-2. Expands on key points with explanations
-3. Includes practical examples where appropriate
-4. Maintains a professional yet accessible tone
-5. Concludes with key takeaways
-
-Write 4-6 paragraphs. Be informative and engaging."""
-
         # Generate expanded content
-        content = generate_with_bedrock(prompt)
+        content = completion or generate_with_bedrock_cached(
+            build_chapter_prompt(topic, title, research_content), 'chapter',
+            f"{topic}\n{title}\n{research_content}", cache_namespace, CHAPTER_MAX_TOKENS
+        )
         
         # Calculate metrics
         word_count = len(content.split())
-        confidence = calculate_chapter_confidence(content, base_confidence)
+        confidence = calculate_chapter_confidence(content, base_confidence, word_count)
         
         return {
             'chapter_number': chapter_number,
@@ -335,7 +622,12 @@ Write 4-6 paragraphs. Be informative and engaging."""
         }
 
 
-def generate_conclusion(topic: str, research_data: List[Dict]) -> Dict[str, Any]:
+def generate_conclusion(
+    topic: str,
+    research_data: List[Dict],
+    completion: Optional[str] = None,
+    cache_namespace: Optional[str] = None
+) -> Dict[str, Any]:
     """
     Generate conclusion chapter that synthesizes key findings.
     
@@ -345,29 +637,19 @@ def generate_conclusion(topic: str, research_data: List[Dict]) -> Dict[str, Any]
     Args:
         topic: Main topic
         research_data: All research insights for synthesis
+        completion: Pre-generated text; Bedrock is called when omitted
+        cache_namespace: Completion cache namespace, or None to disable caching
     
     Returns:
         Chapter dictionary with conclusion content
     """
     try:
-        # Extract key themes for conclusion
-        sections = [item.get('section', '') for item in research_data]
-        
-        prompt = f"""Write a comprehensive conclusion for a guide about {topic}.
-
-The guide covered these topics:
-{', '.join(sections)}
-
-The conclusion should:
-1. Synthesize key insights from throughout the guide
-2. Emphasize the most important takeaways
-3. Provide forward-looking perspective
-4. End with actionable recommendations
-
-Write 3-4 paragraphs that bring the guide to a strong close."""
-
         # Generate conclusion
-        content = generate_with_bedrock(prompt)
+        sections = ', '.join(item.get('section', '') for item in research_data)
+        content = completion or generate_with_bedrock_cached(
+            build_conclusion_prompt(topic, research_data), 'conclusion',
+            f"{topic}\n{sections}", cache_namespace, CONCLUSION_MAX_TOKENS
+        )
         word_count = len(content.split())
         
         return {
@@ -375,7 +657,7 @@ Write 3-4 paragraphs that bring the guide to a strong close."""
             'title': 'Conclusion',
             'content': content,
             'word_count': word_count,
-            'confidence': calculate_chapter_confidence(content),
+            'confidence': calculate_chapter_confidence(content, word_count=word_count),
             'sections': []
         }
         
@@ -392,12 +674,38 @@ Write 3-4 paragraphs that bring the guide to a strong close."""
         }
 
 
-def generate_with_bedrock(prompt: str) -> str:
+def build_introduction_prompt(topic: str) -> str:
+    """Build the introduction prompt."""
+    return INTRO_PROMPT_TPL % {'topic': topic}
+
+
+def build_chapter_prompt(topic: str, title: str, research_content: str) -> str:
+    """Build a chapter prompt."""
+    return CHAPTER_PROMPT_TPL % {
+        'topic': topic,
+        'title': title,
+        'content': research_content
+    }
+
+
+def build_conclusion_prompt(topic: str, research_data: List[Dict]) -> str:
+    """Build the conclusion prompt."""
+    # Extract key themes for conclusion
+    sections = ', '.join(item.get('section', '') for item in research_data)
+    
+    return CONCLUSION_PROMPT_TPL % {'topic': topic, 'sections': sections}
+
+
+def generate_with_bedrock(prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> str:
     """
     Generate text using AWS Bedrock Claude model.
     
+    Uses the streaming invocation API and joins completion fragments
+    as they arrive.
+    
     Args:
         prompt: Text prompt for generation
+        max_tokens: Maximum number of tokens to generate
     
     Returns:
         Generated text content
@@ -406,23 +714,7 @@ def generate_with_bedrock(prompt: str) -> str:
         Exception: If generation fails
     """
     try:
-        request_body = {
-            "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
-            "max_tokens_to_sample": 800,  # Longer for book content
-            "temperature": 0.7,  # Slightly creative for engaging content
-            "top_p": 0.9,
-            "stop_sequences": ["\n\nHuman:"]
-        }
-        
-        response = bedrock_runtime.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            contentType='application/json',
-            accept='application/json',
-            body=json.dumps(request_body)
-        )
-        
-        response_body = json.loads(response['body'].read())
-        content = response_body.get('completion', '').strip()
+        content = _generate_with_completion(prompt, max_tokens)
         
         if not content:
             raise ValueError("Empty response from Bedrock")
@@ -434,7 +726,194 @@ def generate_with_bedrock(prompt: str) -> str:
         raise
 
 
-def calculate_chapter_confidence(content: str, base_confidence: int = 80) -> int:
+def generate_with_bedrock_cached(
+    prompt: str,
+    kind: str,
+    details: str,
+    namespace: Optional[str] = None,
+    max_tokens: int = DEFAULT_MAX_TOKENS
+) -> str:
+    """
+    Generate text through the completion caches.
+    
+    Exact repeats within a warm container are served from an in-memory
+    LRU keyed by a BLAKE2b digest of the prompt. Otherwise, when a semantic
+    cache table is configured, near-duplicate prompts are served from it.
+    
+    Args:
+        prompt: Text prompt for generation
+        kind: Prompt type (introduction, chapter, conclusion)
+        details: Request-specific part of the prompt, compared by the
+            semantic cache
+        namespace: Cache namespace (user), or None to bypass the caches
+        max_tokens: Maximum number of tokens to generate
+    
+    Returns:
+        Generated or cached text content
+    """
+    if namespace is None:
+        return generate_with_bedrock(prompt, max_tokens)
+    
+    digest = hashlib.blake2b(
+        '\0'.join((namespace, prompt)).encode('utf-8'),
+        digest_size=16
+    ).digest()
+    
+    with _completion_cache_lock:
+        cached = _completion_cache.get(digest)
+        if cached is not None:
+            _completion_cache.move_to_end(digest)
+            return cached
+    
+    if semantic_cache is not None:
+        content = _generate_with_semantic_cache(prompt, kind, details, namespace, max_tokens)
+    else:
+        content = generate_with_bedrock(prompt, max_tokens)
+    
+    with _completion_cache_lock:
+        _completion_cache[digest] = content
+        if len(_completion_cache) > COMPLETION_CACHE_SIZE:
+            _completion_cache.popitem(last=False)
+    
+    return content
+
+
+def _generate_with_semantic_cache(
+    prompt: str,
+    kind: str,
+    details: str,
+    namespace: str,
+    max_tokens: int
+) -> str:
+    """
+    Generate text through the DynamoDB semantic cache.
+    
+    The request-specific details are embedded with Titan and compared against
+    cached embeddings for the same namespace and prompt type; a
+    near-duplicate (cosine similarity above SEMANTIC_CACHE_THRESHOLD)
+    returns the stored completion instead of calling the model. Cache
+    failures never fail generation.
+    """
+    # Only the variable part is embedded, so the shared template text can't
+    # make different requests look alike; prompt types are separated by key
+    partition = f"{namespace}#{kind}"
+    embedding = None
+    
+    try:
+        embedding = embed_text(details)
+        cached = _semantic_cache_lookup(partition, embedding)
+        if cached is not None:
+            logger.info(f"Semantic cache hit for {partition}")
+            return cached
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup failed: {str(e)}")
+    
+    content = generate_with_bedrock(prompt, max_tokens)
+    
+    if embedding is not None:
+        try:
+            prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+            semantic_cache.put_item(TableName=SEMANTIC_CACHE_TABLE, Item={
+                'namespace': {'S': partition},
+                # Time-ordered sort key so lookups can read the newest entries
+                'entry_key': {'S': f"{time.time_ns() // 1_000_000:013d}#{prompt_hash}"},
+                'embedding': {'B': array('f', embedding).tobytes()},
+                'completion': {'S': content},
+                'expires_at': {'N': str(int(time.time()) + SEMANTIC_CACHE_TTL)}
+            })
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {str(e)}")
+    
+    return content
+
+
+def embed_text(text: str) -> List[float]:
+    """Return a normalized Titan embedding for text."""
+    response = bedrock_runtime.invoke_model(
+        modelId=EMBEDDING_MODEL_ID,
+        contentType='application/json',
+        accept='application/json',
+        body=json_dumps({
+            'inputText': text,
+            'dimensions': EMBEDDING_DIMENSIONS,
+            'normalize': True
+        })
+    )
+    return json_loads(response['body'].read())['embedding']
+
+
+def _semantic_cache_lookup(partition: str, embedding: List[float]) -> Optional[str]:
+    """
+    Return the best cached completion above the similarity threshold.
+    
+    Only the newest SEMANTIC_CACHE_MAX_ITEMS entries of the partition are
+    compared, following LastEvaluatedKey across pages, so read capacity
+    and CPU per lookup stay bounded as the cache grows.
+    """
+    now = int(time.time())
+    best_score, best_completion = SEMANTIC_CACHE_THRESHOLD, None
+    
+    pages = semantic_cache.get_paginator('query').paginate(
+        TableName=SEMANTIC_CACHE_TABLE,
+        KeyConditionExpression='#ns = :ns',
+        ExpressionAttributeNames={'#ns': 'namespace'},
+        ExpressionAttributeValues={':ns': {'S': partition}},
+        ProjectionExpression='embedding, completion, expires_at',
+        ScanIndexForward=False,
+        PaginationConfig={'MaxItems': SEMANTIC_CACHE_MAX_ITEMS, 'PageSize': 100}
+    )
+    
+    for item in pages.search('Items[]'):
+        # DynamoDB TTL deletion is lazy, so skip entries that already expired
+        if int(item['expires_at']['N']) < now:
+            continue
+        cached = array('f')
+        cached.frombytes(item['embedding']['B'])
+        # Embeddings are normalized, so the dot product is cosine similarity
+        score = sum(a * b for a, b in zip(embedding, cached))
+        if score >= best_score:
+            best_score, best_completion = score, item['completion']['S']
+    
+    return best_completion
+
+
+def build_completion_request(prompt: str, max_tokens: int = DEFAULT_MAX_TOKENS) -> Dict[str, Any]:
+    """Build a text-completion request body for the legacy Claude models."""
+    return {
+        "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+        "max_tokens_to_sample": max_tokens,
+        "temperature": 0.7,  # Slightly creative for engaging content
+        "top_p": 0.9,
+        "stop_sequences": ["\n\nHuman:"]
+    }
+
+
+def _generate_with_completion(prompt: str, max_tokens: int) -> str:
+    """Stream a completion from a legacy text-completion Claude model."""
+    request_body = build_completion_request(prompt, max_tokens)
+    
+    # Stream the completion so text is assembled while tokens arrive
+    response = bedrock_runtime.invoke_model_with_response_stream(
+        modelId=BEDROCK_MODEL_ID,
+        contentType='application/json',
+        accept='application/json',
+        body=json_dumps(request_body)
+    )
+    
+    fragments = []
+    for event in response['body']:
+        chunk = event.get('chunk')
+        if chunk:
+            fragments.append(json_loads(chunk['bytes']).get('completion', ''))
+    
+    return ''.join(fragments).strip()
+
+
+def calculate_chapter_confidence(
+    content: str,
+    base_confidence: int = 80,
+    word_count: Optional[int] = None
+) -> int:
     """
     Calculate confidence score for chapter content.
     
@@ -443,6 +922,7 @@ def calculate_chapter_confidence(content: str, base_confidence: int = 80) -> int
     Args:
         content: Generated chapter content
         base_confidence: Starting confidence score
+        word_count: Precomputed word count, to avoid re-tokenizing content
     
     Returns:
         Confidence score (70-95%)
@@ -450,69 +930,279 @@ def calculate_chapter_confidence(content: str, base_confidence: int = 80) -> int
     confidence = base_confidence
     
     # Length indicates depth
-    word_count = len(content.split())
+    if word_count is None:
+        word_count = len(content.split())
     if word_count > 300:
         confidence += 5
     elif word_count > 200:
         confidence += 3
     
     # Paragraph structure indicates organization
-    paragraphs = content.split('\n\n')
-    if len(paragraphs) >= 3:
+    paragraphs = content.count('\n\n') + 1
+    if paragraphs >= 3:
         confidence += 4
     
     # Ensure valid range
     return max(70, min(95, confidence))
 
 
-def store_book_in_s3(book_content: Dict[str, Any], user_id: str) -> Dict[str, str]:
+def store_book_in_s3(
+    book_content: Dict[str, Any],
+    user_id: str,
+    timestamp: Optional[datetime] = None
+) -> Dict[str, str]:
     """
     Store generated book in S3 in multiple formats.
     
-    Stores both JSON (structured data) and text (readable) formats.
+    Stores both JSON (structured data) and text (readable) formats,
+    uploading them in parallel. When double-write is enabled the JSON is
+    also written to a ".dup" key; readers try the primary key first and
+    fall back to the duplicate on a 404.
     
     Args:
         book_content: Complete book structure
         user_id: User identifier
+        timestamp: Time used in the object keys (defaults to now)
     
     Returns:
         Dictionary with S3 keys for different formats
     """
     try:
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        title_slug = book_content['title'].lower().replace(' ', '-')[:50]
+        timestamp = (timestamp or datetime.utcnow()).strftime('%Y%m%d_%H%M%S')
+        title_slug = book_content['title'].casefold().translate(SLUG_TABLE)[:50]
         
-        # Store JSON format (structured data)
         json_key = f"books/{user_id}/{timestamp}_{title_slug}.json"
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=json_key,
-            Body=json.dumps(book_content, indent=2),
-            ContentType='application/json'
-        )
-        
-        # Generate and store text format (readable)
-        text_content = format_book_as_text(book_content)
         text_key = f"books/{user_id}/{timestamp}_{title_slug}.txt"
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=text_key,
-            Body=text_content,
-            ContentType='text/plain'
-        )
+        
+        json_body = json_dumps(book_content, indent=True)
+        
+        # JSON format (structured data) and text format (readable)
+        uploads = [
+            (json_key, json_body, 'application/json'),
+            (text_key, format_book_as_text(book_content).encode('utf-8'), 'text/plain')
+        ]
+        
+        s3_keys = {'json': json_key, 'text': text_key}
+        if DOUBLE_WRITE_ENABLED:
+            s3_keys['json_backup'] = f"{json_key}.dup"
+            uploads.append((s3_keys['json_backup'], json_body, 'application/json'))
+        
+        # Upload both formats concurrently; result() re-raises any failure
+        with ThreadPoolExecutor(max_workers=len(uploads)) as executor:
+            futures = [
+                executor.submit(upload_to_s3, key, body, content_type)
+                for key, body, content_type in uploads
+            ]
+            for future in futures:
+                future.result()
         
         logger.info(f"Book stored in S3: {json_key}, {text_key}")
         
-        return {
-            'json': json_key,
-            'text': text_key
-        }
+        return s3_keys
         
     except Exception as e:
         logger.error(f"Failed to store book in S3: {str(e)}")
         return {'json': '', 'text': ''}
 
 
+def upload_to_s3(key: str, body: bytes, content_type: str) -> None:
+    """
+    Upload a body to the books bucket.
+    
+    Small bodies use a single put_object; large books are split into
+    16 MB parts uploaded in parallel via the S3 transfer manager.
+    
+    Args:
+        key: Destination object key
+        body: Encoded object content
+        content_type: MIME type stored with the object
+    """
+    if len(body) > MULTIPART_THRESHOLD:
+        s3_client.upload_fileobj(
+            io.BytesIO(body),
+            S3_BUCKET,
+            key,
+            ExtraArgs={'ContentType': content_type},
+            Config=TRANSFER_CONFIG
+        )
+    else:
+        s3_client.put_object(
+            Bucket=S3_BUCKET,
+            Key=key,
+            Body=body,
+            ContentType=content_type
+        )
+
+
+def submit_book_batch_job(
+    topic: str,
+    research_data: List[Dict],
+    title: str,
+    user_id: str
+) -> Dict[str, Any]:
+    """
+    Submit all chapter prompts as a single Bedrock batch inference job.
+    
+    Writes one JSONL record per chapter (introduction, research chapters,
+    conclusion) plus a manifest with the original request to S3, then
+    starts the job. Batch jobs run asynchronously and can take hours, so
+    the book is assembled by a later request via handle_batch_assembly.
+    Bedrock rejects jobs with fewer than BATCH_MIN_RECORDS records, so
+    this mode suits large books or bulk runs rather than single short guides;
+    lambda_handler checks the count before calling this.
+    
+    Args:
+        topic: Main topic of the book
+        research_data: Research insights to expand into chapters
+        title: Book title
+        user_id: User identifier
+    
+    Returns:
+        Job metadata including the job ARN used to assemble the book
+    """
+    if not BEDROCK_BATCH_ROLE_ARN:
+        raise ValueError("BEDROCK_BATCH_ROLE_ARN must be set for batch mode")
+    
+    job_name = f"book-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    input_key = f"{BATCH_PREFIX}/input/{job_name}.jsonl"
+    
+    prompts = [(1, build_introduction_prompt(topic), INTRO_MAX_TOKENS)]
+    for chapter_number, research_item in enumerate(research_data, start=2):
+        prompts.append((
+            chapter_number,
+            build_chapter_prompt(
+                topic,
+                research_item.get('section', ''),
+                research_item.get('details', '')
+            ),
+            CHAPTER_MAX_TOKENS
+        ))
+    prompts.append((
+        len(research_data) + 2,
+        build_conclusion_prompt(topic, research_data),
+        CONCLUSION_MAX_TOKENS
+    ))
+    
+    records = b"\n".join(
+        json_dumps({
+            'recordId': f"chapter-{chapter_number}",
+            'modelInput': build_completion_request(prompt, max_tokens)
+        })
+        for chapter_number, prompt, max_tokens in prompts
+    )
+    
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=input_key,
+        Body=records,
+        ContentType='application/jsonl'
+    )
+    
+    # Keep the original request so the book can be rebuilt from the output
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=f"{BATCH_PREFIX}/manifests/{job_name}.json",
+        Body=json_dumps({
+            'topic': topic,
+            'research_data': research_data,
+            'book_title': title,
+            'user_id': user_id,
+            'input_key': input_key
+        }),
+        ContentType='application/json'
+    )
+    
+    response = bedrock_client.create_model_invocation_job(
+        jobName=job_name,
+        roleArn=BEDROCK_BATCH_ROLE_ARN,
+        modelId=BEDROCK_MODEL_ID,
+        inputDataConfig={
+            's3InputDataConfig': {'s3Uri': f"s3://{S3_BUCKET}/{input_key}"}
+        },
+        outputDataConfig={
+            's3OutputDataConfig': {'s3Uri': f"s3://{S3_BUCKET}/{BATCH_PREFIX}/output/"}
+        }
+    )
+    
+    logger.info(f"Submitted Bedrock batch job {job_name} with {len(prompts)} records")
+    
+    return {
+        'status': 'submitted',
+        'job_name': job_name,
+        'batch_job_arn': response['jobArn'],
+        'book_title': title,
+        'topic': topic,
+        'records': len(prompts)
+    }
+
+
+def handle_batch_assembly(job_arn: str) -> Dict[str, Any]:
+    """
+    Assemble and store a book from a completed Bedrock batch job.
+    
+    Partially completed jobs are assembled too; chapters whose records
+    failed are regenerated live.
+    
+    Args:
+        job_arn: ARN returned by submit_book_batch_job
+    
+    Returns:
+        API Gateway response with book metadata, or the job status
+        (202) while the job is still running
+    """
+    job = bedrock_client.get_model_invocation_job(jobIdentifier=job_arn)
+    status = job['status']
+    
+    if status not in ('Completed', 'PartiallyCompleted'):
+        code = 202 if status in ('Submitted', 'Validating', 'Scheduled', 'InProgress') else 500
+        return create_response(code, {
+            'status': status.lower(),
+            'batch_job_arn': job_arn,
+            'message': job.get('message', '')
+        })
+    
+    job_name = job['jobName']
+    manifest_response = s3_client.get_object(
+        Bucket=S3_BUCKET,
+        Key=f"{BATCH_PREFIX}/manifests/{job_name}.json"
+    )
+    manifest = json_loads(manifest_response['Body'].read())
+    
+    # Bedrock writes <output prefix>/<job id>/<input file name>.out
+    job_id = job_arn.rsplit('/', 1)[-1]
+    input_name = manifest['input_key'].rsplit('/', 1)[-1]
+    output_response = s3_client.get_object(
+        Bucket=S3_BUCKET,
+        Key=f"{BATCH_PREFIX}/output/{job_id}/{input_name}.out"
+    )
+    
+    completions = {}
+    for line in output_response['Body'].iter_lines():
+        if not line:
+            continue
+        record = json_loads(line)
+        completion = record.get('modelOutput', {}).get('completion', '').strip()
+        if completion:
+            chapter_number = int(record['recordId'].rsplit('-', 1)[-1])
+            completions[chapter_number] = completion
+    
+    logger.info(f"Assembling book from batch job {job_name}: "
+                f"{len(completions)} completions")
+    
+    # Failed records are regenerated live by the chapter generators
+    now = datetime.utcnow()
+    book_content = generate_book(
+        manifest['topic'],
+        manifest['research_data'],
+        manifest['book_title'],
+        completions,
+        timestamp=now
+    )
+    s3_keys = store_book_in_s3(book_content, manifest['user_id'], now)
+    
+    return create_response(200, build_book_summary(book_content, s3_keys))
+
+
 def format_book_as_text(book: Dict[str, Any]) -> str:
     """
     Format book content as readable plain text.
@@ -523,57 +1213,78 @@ def format_book_as_text(book: Dict[str, Any]) -> str:
     Returns:
         Formatted text content
     """
-    lines = []
-    
-    # Title page
-    lines.append("=" * 70)
-    lines.append(book['title'].center(70))
-    lines.append("=" * 70)
-    lines.append("")
-    lines.append(f"Author: {book['author']}")
-    lines.append(f"Topic: {book['topic']}")
-    lines.append(f"Generated: {book['timestamp']}")
-    lines.append(f"Word Count: {book['word_count']}")
-    lines.append(f"Confidence Score: {book['average_confidence']}%")
-    lines.append("")
-    lines.append("=" * 70)
-    lines.append("")
-    
-    # Table of Contents
-    lines.append("TABLE OF CONTENTS")
-    lines.append("-" * 70)
-    for item in book['table_of_contents']:
-        lines.append(f"Chapter {item['chapter_number']}: {item['title']}")
-    lines.append("")
-    lines.append("=" * 70)
-    lines.append("")
+    # Title page and table of contents
+    lines = [
+        RULE_HEAVY,
+        book['title'].center(TEXT_WIDTH),
+        RULE_HEAVY,
+        "",
+        f"Author: {book['author']}",
+        f"Topic: {book['topic']}",
+        f"Generated: {book['timestamp']}",
+        f"Word Count: {book['word_count']}",
+        f"Confidence Score: {book['average_confidence']}%",
+        "",
+        RULE_HEAVY,
+        "",
+        "TABLE OF CONTENTS",
+        RULE_LIGHT,
+    ]
+    lines.extend(
+        f"Chapter {item['chapter_number']}: {item['title']}"
+        for item in book['table_of_contents']
+    )
+    lines.extend(("", RULE_HEAVY, ""))
     
     # Chapters
     for chapter in book['chapters']:
-        lines.append(f"CHAPTER {chapter['chapter_number']}: {chapter['title'].upper()}")
-        lines.append("-" * 70)
-        lines.append("")
-        lines.append(chapter['content'])
-        lines.append("")
-        lines.append(f"[Confidence: {chapter['confidence']}% | Words: {chapter['word_count']}]")
-        lines.append("")
-        lines.append("=" * 70)
-        lines.append("")
+        lines.extend((
+            f"CHAPTER {chapter['chapter_number']}: {chapter['title'].upper()}",
+            RULE_LIGHT,
+            "",
+            chapter['content'],
+            "",
+            f"[Confidence: {chapter['confidence']}% | Words: {chapter['word_count']}]",
+            "",
+            RULE_HEAVY,
+            "",
+        ))
     
     return "\n".join(lines)
 
 
-def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
-    """Create API Gateway response with CORS headers."""
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes.
+    
+    Uses orjson when available, which is several times faster than the
+    stdlib encoder on large books and produces bytes ready for S3.
+    
+    Args:
+        data: JSON-serializable data
+        indent: Pretty-print with two-space indentation
+    
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse a JSON document from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def create_response(status_code: int, body: Dict[str, Any], inline: bool = False) -> Dict[str, Any]:
+    """Create API Gateway response with CORS headers; inline leaves body as an object."""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS'
-        },
-        'body': json.dumps(body)
+        'headers': RESPONSE_HEADERS,
+        'body': body if inline else json_dumps(body).decode('utf-8')
     }
 
 
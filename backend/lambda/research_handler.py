@@ -20,28 +20,211 @@ Version: 1.0.0
 import json
 import os
 import boto3
+import functools
+import gzip
+import hashlib
+import io
 import logging
+import re
+import requests
+import threading
+import time
+import uuid
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
 
 # Configure logging for CloudWatch
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-# Bedrock client for AI text generation
-bedrock_runtime = boto3.client(
-    service_name='bedrock-runtime',
-    region_name=os.environ.get('AWS_REGION', 'us-east-1')
-)
+# AWS clients are built on first use and then reused for the life of the
+# container, so code paths that never touch a service don't pay for its
+# client at cold start. Keep-alive sockets skip the TCP/TLS handshake on
+# later calls from the same warm container. Creation is serialized because
+# the first call can come from the section worker threads and boto3's
+# default session is not thread-safe while building clients.
+_client_lock = threading.Lock()
+
+
+@functools.cache
+def get_bedrock():
+    """Bedrock client for AI text generation."""
+    with _client_lock:
+        return boto3.client(
+            service_name='bedrock-runtime',
+            region_name=os.environ.get('AWS_REGION', 'us-east-1'),
+            config=Config(
+                connect_timeout=2,
+                read_timeout=20,
+                # Enough for every section of every topic in a coalesced request
+                max_pool_connections=max(20, MAX_PARALLEL_SECTIONS * MAX_PARALLEL_TOPICS),
+                retries={'max_attempts': 2, 'mode': 'adaptive'},
+                tcp_keepalive=True
+            )
+        )
+
+
+@functools.cache
+def get_bedrock_control():
+    """Bedrock control-plane client, used only for batch inference jobs."""
+    with _client_lock:
+        return boto3.client(
+            service_name='bedrock',
+            region_name=os.environ.get('AWS_REGION', 'us-east-1')
+        )
+
+
+@functools.cache
+def get_lambda():
+    """Lambda client used to hand streamed requests to a background run."""
+    with _client_lock:
+        return boto3.client('lambda')
 
-# S3 client for storing research results
-s3_client = boto3.client('s3')
+
+@functools.cache
+def get_s3():
+    """S3 client for storing research results."""
+    with _client_lock:
+        return boto3.client(
+            's3',
+            config=Config(
+                connect_timeout=2,
+                read_timeout=30,
+                max_pool_connections=20,
+                tcp_keepalive=True
+            )
+        )
+
+
+# Pooled HTTPS session for Groq, reused across warm invocations so fallback
+# calls skip DNS and the TLS handshake. Rate limits and 5xx responses are
+# retried once with a short backoff; Retry-After is ignored, and each call's
+# timeout is capped by the request deadline (see generate_section).
+groq_session = requests.Session()
+groq_session.mount('https://', HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=1,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(['POST']),
+        respect_retry_after_header=False,
+        raise_on_status=False
+    )
+))
 
 # Configuration from environment variables
 S3_BUCKET = os.environ.get('RESEARCH_BUCKET', 'ai-research-results')
 BEDROCK_MODEL_ID = os.environ.get('BEDROCK_MODEL_ID', 'anthropic.claude-v2')
 GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
+MAX_PARALLEL_SECTIONS = int(os.environ.get('MAX_PARALLEL_SECTIONS', '8'))
+# Generation stops this long before the Lambda timeout, leaving time to store
+# results and respond; unfinished sections get fallback content
+DEADLINE_MARGIN = 10.0  # seconds
+GROQ_MIN_TIME = 5.0  # seconds; less than this left and Groq is not tried
+GROQ_READ_TIMEOUT = 20.0  # seconds
+# Topics of a coalesced request run side by side. Matches the orchestrator's
+# largest batch (RESEARCH_BATCH_MAX) so a batch finishes in one wave, well
+# inside the Lambda timeout, instead of queueing topics behind each other
+MAX_PARALLEL_TOPICS = int(os.environ.get('MAX_PARALLEL_TOPICS', '8'))
+
+# IAM role Bedrock assumes to read batch input from and write output to S3
+BEDROCK_BATCH_ROLE_ARN = os.environ.get('BEDROCK_BATCH_ROLE_ARN', '')
+BATCH_PREFIX = 'bedrock-batch'
+BATCH_MIN_RECORDS = 100  # Bedrock's default minimum records per batch job
+
+# Status objects for streamed requests, updated as each section completes
+JOBS_PREFIX = 'jobs'
+# A streamed run marks its job failed this long before the Lambda timeout,
+# since a run killed by the timeout can't record anything
+JOB_TIMEOUT_MARGIN = 3.0  # seconds
+
+# Latency-optimized inference is only offered for specific models (e.g.
+# us.anthropic.claude-3-5-haiku-20241022-v1:0), so it is enabled explicitly
+# together with a matching BEDROCK_MODEL_ID.
+LATENCY_OPTIMIZED = os.environ.get('BEDROCK_LATENCY_OPTIMIZED', 'false').lower() == 'true'
+
+# Exact-match cache of generated sections, one object per topic, stored under
+# this prefix in the research bucket.
+# Bump PROMPT_VERSION whenever section prompts change to invalidate entries.
+CACHE_PREFIX = 'cache'
+PROMPT_VERSION = '1'
+
+# Digit runs counted by confidence scoring; at most MAX_SCORED_NUMBERS earn points
+NUMBER_RE = re.compile(r'\d+')
+MAX_SCORED_NUMBERS = 4
+GZIP_MIN_BYTES = 4096  # Stored research above this is gzip-encoded
+
+# Research bodies above this size are uploaded as parallel multipart uploads
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+    use_threads=True
+)
+
+DEFAULT_SECTIONS = [
+    'Overview',
+    'Key Statistics',
+    'Advantages',
+    'Challenges',
+    'Future Outlook',
+    'Recommendations'
+]
+
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',  # Configure for production
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS'
+}
+
+# Section-specific research prompts, formatted with the topic per request
+SECTION_PROMPT_TEMPLATES = {
+    'Overview': """Provide a comprehensive overview of {topic}. 
+Include definition, key concepts, and current relevance. 
+Be factual and concise (2-3 sentences).""",
+    
+    'Key Statistics': """Provide 2-3 key statistics about {topic}.
+Include recent data with specific numbers and percentages.
+Focus on market size, adoption rates, or growth trends.""",
+    
+    'Advantages': """List the main advantages and benefits of {topic}.
+Include 3-4 key benefits with brief explanations.
+Focus on practical, real-world benefits.""",
+    
+    'Challenges': """Describe the main challenges and limitations of {topic}.
+Include 3-4 significant challenges with brief context.
+Be balanced and objective.""",
+    
+    'Future Outlook': """Provide insights on the future prospects of {topic}.
+Include projections, trends, and expected developments.
+Focus on the next 5-10 years.""",
+    
+    'Recommendations': """Provide practical recommendations for someone considering {topic}.
+Include 3-4 actionable suggestions.
+Focus on evaluation criteria and best practices."""
+}
+
+# Circuit breaker for Bedrock: once more than BREAKER_THRESHOLD calls fail
+# within BREAKER_WINDOW seconds, sections go straight to Groq instead of
+# waiting on retries and timeouts. A single success closes the circuit.
+BREAKER_THRESHOLD = 5
+BREAKER_WINDOW = 60
+_bedrock_failures = {'count': 0, 'window_start': 0.0}
+_breaker_lock = threading.Lock()
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -56,8 +239,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             Expected format: {
                 "topic": "Research topic string",
                 "sections": ["Overview", "Statistics", ...] (optional),
-                "user_id": "unique_user_identifier" (optional)
+                "user_id": "unique_user_identifier" (optional),
+                "no_cache": false (optional, bypass the section cache)
             }
+            With "stream": true the request is accepted with 202 and sections
+            are published to a status object in S3 as each one completes.
+            Bulk research is submitted as a Bedrock batch job with
+            {"operation": "batch_research", "topics": [...], "sections": [...]}
+            and stored by a follow-up {"batch_job_arn": "..."} request once
+            the job has completed.
+            {"operation": "research_many", "requests": [{...}, ...]} runs
+            several research requests and returns their responses in order.
+            {"warmup": true} returns at once without generating anything.
+            With "inline_body": true the response body is an object rather
+            than a JSON string (for direct invocations, not API Gateway).
         context: Lambda context object with runtime information
     
     Returns:
@@ -68,16 +263,61 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "headers": CORS headers
         }
     """
+    # Keep-warm pings from the orchestrator only need the container initialized
+    if event.get('warmup'):
+        return create_response(200, {'warmup': True})
+    
+    # Set when this invocation is the background run of a streamed request
+    stream_job_id = event.get('stream_job_id')
+    job_status = None
+    
+    # Direct invocations (the orchestrator) can take the body as an object,
+    # so the runtime encodes the response once instead of nesting a string
+    inline = bool(event.get('inline_body'))
+    
     try:
         # Log incoming request
-        logger.info(f"Processing research request: {json.dumps(event)}")
+        logger.info(f"Processing research request: {json_dumps(event).decode('utf-8')}")
         
         # Parse request body
         if isinstance(event.get('body'), str):
-            body = json.loads(event['body'])
+            body = json_loads(event['body'])
         else:
             body = event
         
+        # Assemble a previously submitted batch job
+        if body.get('batch_job_arn'):
+            return handle_research_batch_assembly(body['batch_job_arn'], context)
+        
+        # Bulk research goes through Bedrock batch inference
+        if body.get('operation') == 'batch_research':
+            topics = [t.strip() for t in body.get('topics', []) if t and t.strip()]
+            if not topics:
+                return create_response(400, {
+                    'error': 'Topics are required',
+                    'message': 'Please provide a list of research topics'
+                }, inline=inline)
+            sections = body.get('sections', DEFAULT_SECTIONS)
+            record_count = len(topics) * len(sections)
+            if record_count < BATCH_MIN_RECORDS:
+                return create_response(400, {
+                    'error': 'Batch too small',
+                    'message': f'Batch research needs at least {BATCH_MIN_RECORDS} '
+                               f'topic/section records; got {record_count}'
+                }, inline=inline)
+            job = submit_research_batch_job(
+                topics,
+                sections,
+                body.get('user_id', 'anonymous')
+            )
+            return create_response(202, job, inline=inline)
+        
+        # Requests coalesced by the orchestrator share one invocation
+        if body.get('operation') == 'research_many':
+            return create_response(200, {
+                'responses': handle_research_many(body.get('requests', []), context)
+            }, inline=inline)
+        
         topic = body.get('topic', '').strip()
         
         # Validate input
@@ -85,113 +325,447 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             return create_response(400, {
                 'error': 'Topic is required',
                 'message': 'Please provide a research topic'
-            })
+            }, inline=inline)
         
         # Define research sections to generate
-        sections = body.get('sections', [
-            'Overview',
-            'Key Statistics',
-            'Advantages',
-            'Challenges',
-            'Future Outlook',
-            'Recommendations'
-        ])
+        sections = body.get('sections', DEFAULT_SECTIONS)
+        
+        # Lambda's Python runtime can't stream a response body, so streamed
+        # requests return at once and publish sections progressively instead
+        if body.get('stream') and not stream_job_id:
+            return create_response(202, submit_stream_job(body), inline=inline)
+        
+        on_progress = None
+        if stream_job_id:
+            # Lambda retries async invocations that time out; a job that
+            # already ran (and was marked failed) is not run again
+            if read_job_status(stream_job_id) not in (None, 'pending'):
+                logger.warning(f"Skipping retried run of streamed job {stream_job_id}")
+                return create_response(409, {
+                    'error': 'Job already ran',
+                    'job_id': stream_job_id
+                }, inline=inline)
+            
+            job_status = JobStatusWriter(stream_job_id, context)
+            ready = []
+            
+            def on_progress(results: List[Dict[str, Any]]) -> None:
+                ready.extend(results)
+                job_status.progress({
+                    'topic': topic,
+                    'total_sections': len(sections),
+                    'results': ready
+                })
         
         # Generate research insights with AI
         logger.info(f"Generating research for topic: {topic}")
-        research_results = generate_research(topic, sections)
+        research_results = generate_research(
+            topic, sections, use_cache=not body.get('no_cache'),
+            on_progress=on_progress, deadline=request_deadline(context)
+        )
+        
+        # One timestamp for the stored object, its key and the response
+        now = datetime.utcnow()
         
         # Store results in S3 for persistence
         user_id = body.get('user_id', 'anonymous')
-        s3_key = store_research_in_s3(topic, research_results, user_id)
+        topic_slug = topic.lower().replace(' ', '-')[:50]
+        s3_key = store_research_in_s3(
+            topic, research_results, user_id,
+            timestamp=now, topic_slug=topic_slug
+        )
         
         # Prepare response with research data
         response_data = {
             'topic': topic,
             'results': research_results,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now.isoformat(),
             's3_key': s3_key,
             'total_sections': len(research_results),
             'average_confidence': calculate_average_confidence(research_results)
         }
         
+        if job_status is not None:
+            job_status.finish('completed', response_data)
+        
         logger.info(f"Research completed successfully for: {topic}")
-        return create_response(200, response_data)
+        return create_response(200, response_data, inline=inline)
         
     except Exception as e:
         logger.error(f"Error processing research request: {str(e)}", exc_info=True)
+        if stream_job_id:
+            try:
+                (job_status or JobStatusWriter(stream_job_id)).finish(
+                    'failed', {'message': str(e)}
+                )
+            except Exception as status_error:
+                logger.error(f"Failed to mark job {stream_job_id} failed: {str(status_error)}")
         return create_response(500, {
             'error': 'Internal server error',
             'message': str(e)
-        })
+        }, inline=inline)
+
+
+def request_deadline(context: Any) -> Optional[float]:
+    """
+    Return the monotonic time by which section generation must stop.
+    
+    Derived from the invocation's remaining time, less DEADLINE_MARGIN, so
+    a slow provider can't run the invocation into the Lambda timeout. None
+    when there is no Lambda context (local runs).
+    """
+    if context is None:
+        return None
+    return time.monotonic() + context.get_remaining_time_in_millis() / 1000 - DEADLINE_MARGIN
 
 
-def generate_research(topic: str, sections: List[str]) -> List[Dict[str, Any]]:
+def handle_research_many(requests: List[Dict[str, Any]], context: Any) -> List[Dict[str, Any]]:
+    """
+    Run several research requests in one invocation.
+    
+    Each request is handled exactly as if it had been sent on its own, up
+    to MAX_PARALLEL_TOPICS at a time, so one slow topic doesn't hold up
+    the others for long.
+    
+    Args:
+        requests: Research request bodies
+        context: Lambda context object
+    
+    Returns:
+        One API Gateway response per request, in request order
+    """
+    if not requests:
+        return []
+    
+    workers = min(len(requests), MAX_PARALLEL_TOPICS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda request: lambda_handler(request, context), requests))
+
+
+def submit_stream_job(body: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Accept a research request for progressive delivery.
+    
+    Records a pending job in S3 and re-invokes this function asynchronously
+    (InvocationType=Event) with the request. The background run rewrites the
+    status object each time sections complete, so clients polling it (e.g.
+    through the s3-handler retrieve operation) can render the first section
+    long before the slowest one finishes.
+    
+    Args:
+        body: Validated request body
+    
+    Returns:
+        Job metadata for the 202 response
+    """
+    job_id = uuid.uuid4().hex
+    status_key = write_job_status(job_id, 'pending')
+    
+    payload = {key: value for key, value in body.items() if key != 'stream'}
+    payload['stream_job_id'] = job_id
+    
+    get_lambda().invoke(
+        FunctionName=os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'research-handler'),
+        InvocationType='Event',
+        Payload=json_dumps(payload)
+    )
+    
+    logger.info(f"Accepted streamed research job: {job_id}")
+    
+    return {
+        'job_id': job_id,
+        'status': 'pending',
+        'status_bucket': S3_BUCKET,
+        'status_key': status_key
+    }
+
+
+def write_job_status(
+    job_id: str,
+    status: str,
+    result: Optional[Dict[str, Any]] = None
+) -> str:
+    """Write the status object for a streamed job and return its S3 key."""
+    status_key = f"{JOBS_PREFIX}/{job_id}.json"
+    get_s3().put_object(
+        Bucket=S3_BUCKET,
+        Key=status_key,
+        Body=json_dumps({
+            'job_id': job_id,
+            'status': status,
+            'result': result or {},
+            'updated_at': datetime.utcnow().isoformat()
+        }),
+        ContentType='application/json',
+        CacheControl='no-cache'
+    )
+    return status_key
+
+
+def read_job_status(job_id: str) -> Optional[str]:
+    """Return the status of a streamed job, or None if it can't be read."""
+    try:
+        response = get_s3().get_object(Bucket=S3_BUCKET, Key=f"{JOBS_PREFIX}/{job_id}.json")
+        return json_loads(response['Body'].read()).get('status')
+    except Exception as e:
+        logger.warning(f"Could not read status of job {job_id}: {str(e)}")
+        return None
+
+
+class JobStatusWriter:
+    """
+    Publishes the status object of one streamed job from its background run.
+    
+    Progress writes are best-effort: a failed PUT is logged and the next
+    update carries every section again. The first final status written
+    ('completed' or 'failed') sticks, and with a Lambda context a timer
+    writes 'failed' JOB_TIMEOUT_MARGIN seconds before the timeout, so
+    pollers never wait on a run the timeout killed.
+    """
+    
+    def __init__(self, job_id: str, context: Any = None):
+        self.job_id = job_id
+        self._lock = threading.Lock()
+        self._finished = False
+        self._timer = None
+        if context is not None:
+            delay = context.get_remaining_time_in_millis() / 1000 - JOB_TIMEOUT_MARGIN
+            self._timer = threading.Timer(max(0.0, delay), self._expire)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def progress(self, result: Dict[str, Any]) -> None:
+        """Write a 'running' update unless the job already finished."""
+        with self._lock:
+            if self._finished:
+                return
+            try:
+                write_job_status(self.job_id, 'running', result)
+            except Exception as e:
+                logger.warning(f"Progress write failed for job {self.job_id}: {str(e)}")
+    
+    def finish(self, status: str, result: Dict[str, Any]) -> None:
+        """Write the final status; raises if the write fails."""
+        if self._timer is not None:
+            self._timer.cancel()
+        with self._lock:
+            if self._finished:
+                return
+            write_job_status(self.job_id, status, result)
+            self._finished = True
+    
+    def _expire(self) -> None:
+        try:
+            self.finish('failed', {'message': 'Research timed out'})
+        except Exception as e:
+            logger.error(f"Failed to mark job {self.job_id} timed out: {str(e)}")
+
+
+def generate_research(
+    topic: str,
+    sections: List[str],
+    use_cache: bool = True,
+    on_progress: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+    deadline: Optional[float] = None
+) -> List[Dict[str, Any]]:
     """
     Generate comprehensive research insights using AI models.
     
     This function uses AWS Bedrock (primary) with Groq as fallback to generate
-    research content for each section. Each insight includes confidence scoring
-    based on the model's response quality and certainty.
+    research content for each section. Sections are generated concurrently,
+    since each one is dominated by the model round-trip, and results are
+    returned in the order the sections were requested. Each insight includes
+    confidence scoring based on the model's response quality and certainty.
     
     Args:
         topic: Research topic to analyze
         sections: List of section names to generate content for
+        use_cache: Serve and store sections via the exact-match S3 topic cache
+        on_progress: Called with newly available results, first with the
+            cached sections and then with each section as it completes
+        deadline: Monotonic time (see request_deadline) after which sections
+            still in flight are given fallback content
     
     Returns:
         List of research insights with section, details, and confidence scores
     """
-    research_results = []
+    if not sections:
+        return []
+    
+    use_cache = use_cache and not s3_storage_disabled()
+    
+    # All cached sections for a topic live in one object: one read per request
+    cached = get_cached_sections(topic) if use_cache else {}
+    missing = list(dict.fromkeys(section for section in sections if section not in cached))
+    
+    if cached:
+        logger.info(f"Section cache hits: {len(sections) - len(missing)}/{len(sections)}")
     
-    for section in sections:
+    if on_progress is not None:
+        hits = [cached[section] for section in dict.fromkeys(sections) if section in cached]
+        if hits:
+            on_progress(hits)
+    
+    generated = {}
+    if missing:
+        workers = min(len(missing), MAX_PARALLEL_SECTIONS)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        executor = ThreadPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(generate_section, topic, section, deadline)
+            for section in missing
+        ]
         try:
-            # Generate section content using AI
-            logger.info(f"Generating content for section: {section}")
-            
-            # Create prompt for the AI model
-            prompt = create_research_prompt(topic, section)
-            
-            # Call Bedrock API for high-quality generation
-            content = generate_with_bedrock(prompt)
-            
-            # Calculate confidence score based on response quality
-            confidence = calculate_confidence_score(content, section)
-            
-            research_results.append({
-                'section': section,
-                'details': content,
-                'confidence': confidence,
-                'source': 'bedrock'
-            })
-            
-            logger.info(f"Generated {section} with {confidence}% confidence")
-            
-        except Exception as e:
-            logger.warning(f"Bedrock failed for {section}, trying Groq: {str(e)}")
-            
-            # Fallback to Groq API
-            try:
-                content = generate_with_groq(prompt)
-                confidence = calculate_confidence_score(content, section)
-                
-                research_results.append({
-                    'section': section,
-                    'details': content,
-                    'confidence': confidence,
-                    'source': 'groq'
-                })
-                
-            except Exception as groq_error:
-                logger.error(f"Both Bedrock and Groq failed for {section}: {str(groq_error)}")
-                # Add fallback content with low confidence
-                research_results.append({
-                    'section': section,
-                    'details': f"Research data for {section} is currently unavailable. Please try again later.",
-                    'confidence': 50,
-                    'source': 'fallback'
-                })
+            for future in as_completed(futures, timeout=timeout):
+                result = future.result()
+                generated[result['section']] = result
+                if on_progress is not None:
+                    on_progress([result])
+        except TimeoutError:
+            logger.warning(f"Deadline reached with {len(missing) - len(generated)} "
+                           f"sections unfinished for {topic}")
+        finally:
+            # Don't wait for calls still in flight past the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        for section in missing:
+            if section not in generated:
+                generated[section] = fallback_section(section)
+    
+    # Coalesce new model output into a single cache write; fallback content
+    # is not cached so the next request retries the models
+    new_entries = {
+        section: result for section, result in generated.items()
+        if result['source'] != 'fallback'
+    }
+    if use_cache and new_entries:
+        cache_sections(topic, {**cached, **new_entries})
+    
+    return [cached.get(section) or generated[section] for section in sections]
+
+
+def generate_section(
+    topic: str,
+    section: str,
+    deadline: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Generate a single research section with Bedrock, falling back to Groq.
+    
+    Never raises: if both providers fail, low-confidence fallback content
+    is returned so one section cannot fail the whole request.
+    
+    Args:
+        topic: Research topic to analyze
+        section: Section name to generate content for
+        deadline: Monotonic time after which Groq is not tried; its
+            timeout is capped by the time left
+    
+    Returns:
+        Research insight with section, details, confidence and source
+    """
+    # Create prompt for the AI model
+    prompt = create_research_prompt(topic, section)
     
-    return research_results
+    try:
+        # Generate section content using AI
+        logger.info(f"Generating content for section: {section}")
+        
+        # Call Bedrock API for high-quality generation
+        content = generate_with_bedrock(prompt)
+        
+        # Calculate confidence score based on response quality
+        confidence = calculate_confidence_score(content, section)
+        
+        logger.info(f"Generated {section} with {confidence}% confidence")
+        
+        return {
+            'section': section,
+            'details': content,
+            'confidence': confidence,
+            'source': 'bedrock'
+        }
+        
+    except Exception as e:
+        logger.warning(f"Bedrock failed for {section}, trying Groq: {str(e)}")
+    
+    # Fallback to Groq API, if there is still time for it
+    read_timeout = GROQ_READ_TIMEOUT
+    if deadline is not None:
+        read_timeout = min(read_timeout, deadline - time.monotonic())
+        if read_timeout < GROQ_MIN_TIME:
+            logger.error(f"No time left to try Groq for {section}")
+            return fallback_section(section)
+    
+    try:
+        content = generate_with_groq(prompt, read_timeout)
+        confidence = calculate_confidence_score(content, section)
+        
+        return {
+            'section': section,
+            'details': content,
+            'confidence': confidence,
+            'source': 'groq'
+        }
+        
+    except Exception as groq_error:
+        logger.error(f"Both Bedrock and Groq failed for {section}: {str(groq_error)}")
+        return fallback_section(section)
+
+
+def fallback_section(section: str) -> Dict[str, Any]:
+    """Low-confidence placeholder for a section no provider could generate."""
+    return {
+        'section': section,
+        'details': f"Research data for {section} is currently unavailable. Please try again later.",
+        'confidence': 50,
+        'source': 'fallback'
+    }
+
+
+def topic_cache_key(topic: str) -> str:
+    """Build the S3 key of the cached sections for a topic."""
+    digest = hashlib.sha256(
+        f"{topic}|{BEDROCK_MODEL_ID}|{PROMPT_VERSION}".encode('utf-8')
+    ).hexdigest()
+    return f"{CACHE_PREFIX}/{digest}.json"
+
+
+def get_cached_sections(topic: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch all cached section results for a topic from S3.
+    
+    Args:
+        topic: Research topic
+    
+    Returns:
+        Cached research insights keyed by section name; empty on a miss
+        or read error
+    """
+    try:
+        response = get_s3().get_object(
+            Bucket=S3_BUCKET,
+            Key=topic_cache_key(topic)
+        )
+        return json_loads(response['Body'].read())
+    except get_s3().exceptions.NoSuchKey:
+        return {}
+    except Exception as e:
+        logger.warning(f"Section cache read failed for {topic}: {str(e)}")
+        return {}
+
+
+def cache_sections(topic: str, sections: Dict[str, Dict[str, Any]]) -> None:
+    """Store a topic's section results in the S3 cache; failures are logged."""
+    try:
+        get_s3().put_object(
+            Bucket=S3_BUCKET,
+            Key=topic_cache_key(topic),
+            Body=json_dumps(sections),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        logger.warning(f"Section cache write failed for {topic}: {str(e)}")
 
 
 def create_research_prompt(topic: str, section: str) -> str:
@@ -208,34 +782,12 @@ def create_research_prompt(topic: str, section: str) -> str:
     Returns:
         Formatted prompt string for the AI model
     """
-    section_prompts = {
-        'Overview': f"""Provide a comprehensive overview of {topic}. 
-Include definition, key concepts, and current relevance. 
-Be factual and concise (2-3 sentences).""",
-        
-        'Key Statistics': f"""Provide 2-3 key statistics about {topic}.
-Include recent data with specific numbers and percentages.
-Focus on market size, adoption rates, or growth trends.""",
-        
-        'Advantages': f"""List the main advantages and benefits of {topic}.
-Include 3-4 key benefits with brief explanations.
-Focus on practical, real-world benefits.""",
-        
-        'Challenges': f"""Describe the main challenges and limitations of {topic}.
-Include 3-4 significant challenges with brief context.
-Be balanced and objective.""",
-        
-        'Future Outlook': f"""Provide insights on the future prospects of {topic}.
-Include projections, trends, and expected developments.
-Focus on the next 5-10 years.""",
-        
-        'Recommendations': f"""Provide practical recommendations for someone considering {topic}.
-Include 3-4 actionable suggestions.
-Focus on evaluation criteria and best practices."""
-    }
+    template = SECTION_PROMPT_TEMPLATES.get(section)
     
     # Use section-specific prompt or default
-    return section_prompts.get(section, f"Provide detailed information about {section} for {topic}.")
+    if template:
+        return template.format(topic=topic)
+    return f"Provide detailed information about {section} for {topic}."
 
 
 def generate_with_bedrock(prompt: str) -> str:
@@ -243,7 +795,9 @@ def generate_with_bedrock(prompt: str) -> str:
     Generate text using AWS Bedrock with Claude model.
     
     AWS Bedrock provides access to high-quality foundation models like Claude,
-    which excel at generating coherent, factual content.
+    which excel at generating coherent, factual content. When latency-optimized
+    inference is enabled the Converse API is used with
+    performanceConfig={'latency': 'optimized'}.
     
     Args:
         prompt: Text prompt for the AI model
@@ -252,41 +806,142 @@ def generate_with_bedrock(prompt: str) -> str:
         Generated text content
     
     Raises:
-        Exception: If Bedrock API call fails
+        Exception: If Bedrock API call fails or the circuit breaker is open
     """
+    if bedrock_circuit_open():
+        raise RuntimeError("Bedrock circuit open after repeated failures")
+    
     try:
-        # Prepare request body for Claude model
-        request_body = {
-            "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
-            "max_tokens_to_sample": 300,
-            "temperature": 0.5,  # Lower temperature for more factual responses
-            "top_p": 0.9,
-            "stop_sequences": ["\n\nHuman:"]
-        }
+        if LATENCY_OPTIMIZED:
+            content = generate_with_converse(prompt)
+            record_bedrock_result(True)
+            return content
         
         # Invoke Bedrock model
-        response = bedrock_runtime.invoke_model(
+        response = get_bedrock().invoke_model(
             modelId=BEDROCK_MODEL_ID,
             contentType='application/json',
             accept='application/json',
-            body=json.dumps(request_body)
+            body=json_dumps(build_completion_request(prompt))
         )
         
         # Parse response
-        response_body = json.loads(response['body'].read())
+        response_body = json_loads(response['body'].read())
         content = response_body.get('completion', '').strip()
         
         if not content:
             raise ValueError("Empty response from Bedrock")
         
+        record_bedrock_result(True)
         return content
         
     except Exception as e:
+        record_bedrock_result(False)
         logger.error(f"Bedrock generation failed: {str(e)}")
         raise
 
 
-def generate_with_groq(prompt: str) -> str:
+def bedrock_circuit_open() -> bool:
+    """Return True while recent Bedrock failures exceed the breaker threshold."""
+    with _breaker_lock:
+        if time.monotonic() - _bedrock_failures['window_start'] > BREAKER_WINDOW:
+            _bedrock_failures['count'] = 0
+            return False
+        return _bedrock_failures['count'] > BREAKER_THRESHOLD
+
+
+def record_bedrock_result(success: bool) -> None:
+    """Update the Bedrock circuit breaker after a call."""
+    with _breaker_lock:
+        if success:
+            _bedrock_failures['count'] = 0
+            return
+        now = time.monotonic()
+        if now - _bedrock_failures['window_start'] > BREAKER_WINDOW:
+            _bedrock_failures['count'] = 0
+            _bedrock_failures['window_start'] = now
+        _bedrock_failures['count'] += 1
+
+
+def build_completion_request(prompt: str) -> Dict[str, Any]:
+    """Build the Claude text-completion request body for a prompt."""
+    return {
+        "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+        "max_tokens_to_sample": 300,
+        "temperature": 0.5,  # Lower temperature for more factual responses
+        "top_p": 0.9,
+        "stop_sequences": ["\n\nHuman:"]
+    }
+
+
+def uses_text_completion(model_id: str = BEDROCK_MODEL_ID) -> bool:
+    """Return True for Claude models that only accept text-completion bodies."""
+    # Strip cross-region inference profile prefixes such as "us."
+    base_id = model_id.split('.', 1)[1] if model_id.count('.') > 1 else model_id
+    return base_id.startswith(('anthropic.claude-v2', 'anthropic.claude-instant'))
+
+
+def build_batch_model_input(prompt: str) -> Dict[str, Any]:
+    """
+    Build a batch inference record body for BEDROCK_MODEL_ID.
+    
+    Batch jobs go through InvokeModel rather than Converse, so the body
+    must match the model family: text completion for Claude v2 / Instant,
+    the Anthropic Messages format for Claude 3 and later.
+    """
+    if uses_text_completion():
+        return build_completion_request(prompt)
+    return {
+        "anthropic_version": "bedrock-2023-05-31",
+        "max_tokens": 300,
+        "temperature": 0.5,
+        "top_p": 0.9,
+        "messages": [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
+    }
+
+
+def parse_batch_model_output(output: Dict[str, Any]) -> str:
+    """Extract the generated text from a batch output record of either format."""
+    if 'completion' in output:
+        return output['completion'].strip()
+    return ''.join(
+        block.get('text', '') for block in output.get('content', [])
+    ).strip()
+
+
+def generate_with_converse(prompt: str) -> str:
+    """
+    Generate text via the Bedrock Converse API with latency-optimized inference.
+    
+    Args:
+        prompt: Text prompt for the AI model
+    
+    Returns:
+        Generated text content
+    
+    Raises:
+        Exception: If the Converse call fails or returns no text
+    """
+    response = get_bedrock().converse(
+        modelId=BEDROCK_MODEL_ID,
+        messages=[{'role': 'user', 'content': [{'text': prompt}]}],
+        inferenceConfig={
+            'maxTokens': 300,
+            'temperature': 0.5,  # Lower temperature for more factual responses
+            'topP': 0.9
+        },
+        performanceConfig={'latency': 'optimized'}
+    )
+    
+    content = response['output']['message']['content'][0]['text'].strip()
+    
+    if not content:
+        raise ValueError("Empty response from Bedrock")
+    
+    return content
+
+
+def generate_with_groq(prompt: str, read_timeout: Optional[float] = None) -> str:
     """
     Generate text using Groq API with Llama model.
     
@@ -295,6 +950,8 @@ def generate_with_groq(prompt: str) -> str:
     
     Args:
         prompt: Text prompt for the AI model
+        read_timeout: Seconds to wait for the response (GROQ_READ_TIMEOUT
+            when omitted)
     
     Returns:
         Generated text content
@@ -302,8 +959,6 @@ def generate_with_groq(prompt: str) -> str:
     Raises:
         Exception: If Groq API call fails
     """
-    import requests
-    
     try:
         # Groq API endpoint
         url = "https://api.groq.com/openai/v1/chat/completions"
@@ -331,7 +986,7 @@ def generate_with_groq(prompt: str) -> str:
         }
         
         # Make API request
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = groq_session.post(url, headers=headers, json=payload, timeout=(3, read_timeout or GROQ_READ_TIMEOUT))
         response.raise_for_status()
         
         # Extract content from response
@@ -363,8 +1018,6 @@ def calculate_confidence_score(content: str, section: str) -> int:
     Returns:
         Confidence score as integer percentage (70-98%)
     """
-    import re
-    
     # Base confidence starts at 75%
     confidence = 75
     
@@ -374,17 +1027,22 @@ def calculate_confidence_score(content: str, section: str) -> int:
     elif len(content) > 150:
         confidence += 3
     
-    # Check for specific numbers/statistics (indicates factual content)
-    numbers = re.findall(r'\d+', content)
-    if numbers:
-        confidence += min(len(numbers) * 2, 8)  # Max 8 points
+    # Check for specific numbers/statistics (indicates factual content).
+    # Scoring caps at MAX_SCORED_NUMBERS, so stop scanning once it is reached.
+    numbers_count = 0
+    for _ in NUMBER_RE.finditer(content):
+        numbers_count += 1
+        if numbers_count >= MAX_SCORED_NUMBERS:
+            break
+    if numbers_count:
+        confidence += numbers_count * 2  # Max 8 points
     
     # Check for percentages (strong indicator of data-driven content)
     if '%' in content:
         confidence += 5
     
     # Section-specific adjustments
-    if section == 'Key Statistics' and numbers:
+    if section == 'Key Statistics' and numbers_count:
         confidence += 5  # Statistics should have numbers
     
     if section == 'Overview' and len(content) > 100:
@@ -396,7 +1054,13 @@ def calculate_confidence_score(content: str, section: str) -> int:
     return confidence
 
 
-def store_research_in_s3(topic: str, results: List[Dict], user_id: str) -> str:
+def store_research_in_s3(
+    topic: str,
+    results: List[Dict],
+    user_id: str,
+    timestamp: Optional[datetime] = None,
+    topic_slug: Optional[str] = None
+) -> str:
     """
     Store research results in S3 for persistence and future retrieval.
     
@@ -406,39 +1070,64 @@ def store_research_in_s3(topic: str, results: List[Dict], user_id: str) -> str:
         topic: Research topic
         results: List of research insights
         user_id: User identifier
+        timestamp: Time used in the object key and payload (defaults to now)
+        topic_slug: Precomputed key slug for the topic (derived if omitted)
     
     Returns:
-        S3 object key where data was stored
+        S3 object key where data was stored, or "" when S3 is skipped
     """
+    if s3_storage_disabled():
+        logger.info("S3 storage skipped (RESEARCH_SKIP_S3)")
+        return ""
+    
     try:
         # Generate S3 key with timestamp
-        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-        topic_slug = topic.lower().replace(' ', '-')[:50]
-        s3_key = f"research/{user_id}/{timestamp}_{topic_slug}.json"
+        now = timestamp or datetime.utcnow()
+        if topic_slug is None:
+            topic_slug = topic.lower().replace(' ', '-')[:50]
+        s3_key = f"research/{user_id}/{now.strftime('%Y%m%d_%H%M%S')}_{topic_slug}.json"
         
         # Prepare data for storage
         data = {
             'topic': topic,
             'results': results,
             'user_id': user_id,
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': now.isoformat(),
             'metadata': {
                 'total_sections': len(results),
                 'average_confidence': calculate_average_confidence(results)
             }
         }
         
-        # Upload to S3
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=s3_key,
-            Body=json.dumps(data, indent=2),
-            ContentType='application/json',
-            Metadata={
+        # Compact JSON, gzipped when it is large enough to be worth it
+        payload = json_dumps(data)
+        put_args = {
+            'ContentType': 'application/json',
+            'Metadata': {
                 'topic': topic,
                 'user_id': user_id
             }
-        )
+        }
+        if len(payload) > GZIP_MIN_BYTES:
+            payload = gzip.compress(payload, compresslevel=1)
+            put_args['ContentEncoding'] = 'gzip'
+        
+        # Upload to S3; very large deep-dives are split into parallel parts
+        if len(payload) > MULTIPART_THRESHOLD:
+            get_s3().upload_fileobj(
+                io.BytesIO(payload),
+                S3_BUCKET,
+                s3_key,
+                ExtraArgs=put_args,
+                Config=TRANSFER_CONFIG
+            )
+        else:
+            get_s3().put_object(
+                Bucket=S3_BUCKET,
+                Key=s3_key,
+                Body=payload,
+                **put_args
+            )
         
         logger.info(f"Research stored in S3: {s3_key}")
         return s3_key
@@ -449,6 +1138,222 @@ def store_research_in_s3(topic: str, results: List[Dict], user_id: str) -> str:
         return ""
 
 
+def submit_research_batch_job(
+    topics: List[str],
+    sections: List[str],
+    user_id: str
+) -> Dict[str, Any]:
+    """
+    Submit every (topic, section) prompt as a single Bedrock batch inference job.
+    
+    Writes one JSONL record per prompt plus a manifest with the original
+    request to S3, then starts the job. Batch jobs run asynchronously and
+    can take hours, so results are stored by a later request via
+    handle_research_batch_assembly. Bedrock rejects jobs with fewer than
+    BATCH_MIN_RECORDS records, so this mode is meant for bulk ingest.
+    Record bodies follow the model family of BEDROCK_MODEL_ID (see
+    build_batch_model_input); only Anthropic Claude models are supported.
+    
+    Args:
+        topics: Research topics to analyze
+        sections: Section names to generate for every topic
+        user_id: User identifier
+    
+    Returns:
+        Job metadata including the job ARN used to assemble the results
+    """
+    if not BEDROCK_BATCH_ROLE_ARN:
+        raise ValueError("BEDROCK_BATCH_ROLE_ARN must be set for batch research")
+    
+    job_name = f"research-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    input_key = f"{BATCH_PREFIX}/input/{job_name}.jsonl"
+    
+    records = b"\n".join(
+        json_dumps({
+            'recordId': f"t{topic_index}-s{section_index}",
+            'modelInput': build_batch_model_input(create_research_prompt(topic, section))
+        })
+        for topic_index, topic in enumerate(topics)
+        for section_index, section in enumerate(sections)
+    )
+    
+    s3 = get_s3()
+    s3.put_object(
+        Bucket=S3_BUCKET,
+        Key=input_key,
+        Body=records,
+        ContentType='application/jsonl'
+    )
+    
+    # Keep the original request so the results can be rebuilt from the output
+    s3.put_object(
+        Bucket=S3_BUCKET,
+        Key=f"{BATCH_PREFIX}/manifests/{job_name}.json",
+        Body=json_dumps({
+            'topics': topics,
+            'sections': sections,
+            'user_id': user_id,
+            'input_key': input_key
+        }),
+        ContentType='application/json'
+    )
+    
+    response = get_bedrock_control().create_model_invocation_job(
+        jobName=job_name,
+        roleArn=BEDROCK_BATCH_ROLE_ARN,
+        modelId=BEDROCK_MODEL_ID,
+        inputDataConfig={
+            's3InputDataConfig': {'s3Uri': f"s3://{S3_BUCKET}/{input_key}"}
+        },
+        outputDataConfig={
+            's3OutputDataConfig': {'s3Uri': f"s3://{S3_BUCKET}/{BATCH_PREFIX}/output/"}
+        }
+    )
+    
+    record_count = len(topics) * len(sections)
+    logger.info(f"Submitted Bedrock batch job {job_name} with {record_count} records")
+    
+    return {
+        'status': 'submitted',
+        'job_name': job_name,
+        'batch_job_arn': response['jobArn'],
+        'topics': len(topics),
+        'records': record_count
+    }
+
+
+def handle_research_batch_assembly(job_arn: str, context: Any = None) -> Dict[str, Any]:
+    """
+    Score and store research from a completed Bedrock batch job.
+    
+    Partially completed jobs are assembled too: sections whose batch record
+    failed are regenerated live through the normal Bedrock/Groq path, up to
+    MAX_PARALLEL_SECTIONS at a time, then each topic is stored like a
+    regular research request. Sections still unfinished at the request
+    deadline get fallback content and are listed per topic under
+    'missing_sections'.
+    
+    Args:
+        job_arn: ARN returned by submit_research_batch_job
+        context: Lambda context object, used for the request deadline
+    
+    Returns:
+        API Gateway response with per-topic S3 keys, or the job status
+        (202) while the job is still running
+    """
+    job = get_bedrock_control().get_model_invocation_job(jobIdentifier=job_arn)
+    status = job['status']
+    
+    if status not in ('Completed', 'PartiallyCompleted'):
+        code = 202 if status in ('Submitted', 'Validating', 'Scheduled', 'InProgress') else 500
+        return create_response(code, {
+            'status': status.lower(),
+            'batch_job_arn': job_arn,
+            'message': job.get('message', '')
+        })
+    
+    s3 = get_s3()
+    job_name = job['jobName']
+    manifest_response = s3.get_object(
+        Bucket=S3_BUCKET,
+        Key=f"{BATCH_PREFIX}/manifests/{job_name}.json"
+    )
+    manifest = json_loads(manifest_response['Body'].read())
+    topics = manifest['topics']
+    sections = manifest['sections']
+    
+    # Bedrock writes <output prefix>/<job id>/<input file name>.out
+    job_id = job_arn.rsplit('/', 1)[-1]
+    input_name = manifest['input_key'].rsplit('/', 1)[-1]
+    output_response = s3.get_object(
+        Bucket=S3_BUCKET,
+        Key=f"{BATCH_PREFIX}/output/{job_id}/{input_name}.out"
+    )
+    
+    completions = {}
+    for line in output_response['Body'].iter_lines():
+        if not line:
+            continue
+        record = json_loads(line)
+        completion = parse_batch_model_output(record.get('modelOutput', {}))
+        if completion:
+            completions[record['recordId']] = completion
+    
+    logger.info(f"Assembling research from batch job {job_name}: "
+                f"{len(completions)} completions")
+    
+    results = {}
+    failed = []
+    for topic_index, topic in enumerate(topics):
+        for section_index, section in enumerate(sections):
+            record_id = f"t{topic_index}-s{section_index}"
+            content = completions.get(record_id)
+            if content is None:
+                failed.append((record_id, topic, section))
+                continue
+            results[record_id] = {
+                'section': section,
+                'details': content,
+                'confidence': calculate_confidence_score(content, section),
+                'source': 'bedrock-batch'
+            }
+    
+    # Regenerate failed records concurrently, as generate_research does
+    if failed:
+        logger.info(f"Regenerating {len(failed)} failed batch records")
+        deadline = request_deadline(context)
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        executor = ThreadPoolExecutor(max_workers=min(len(failed), MAX_PARALLEL_SECTIONS))
+        futures = {
+            executor.submit(generate_section, topic, section, deadline): record_id
+            for record_id, topic, section in failed
+        }
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                results[futures[future]] = future.result()
+        except TimeoutError:
+            unfinished = sum(1 for record_id, _, _ in failed if record_id not in results)
+            logger.warning(f"Deadline reached with {unfinished} failed records not regenerated")
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        for record_id, _, section in failed:
+            if record_id not in results:
+                results[record_id] = fallback_section(section)
+    
+    now = datetime.utcnow()
+    stored = []
+    user_id = manifest['user_id']
+    for topic_index, topic in enumerate(topics):
+        topic_results = [
+            results[f"t{topic_index}-s{section_index}"]
+            for section_index in range(len(sections))
+        ]
+        s3_key = store_research_in_s3(topic, topic_results, user_id, timestamp=now)
+        stored.append({
+            'topic': topic,
+            's3_key': s3_key,
+            'total_sections': len(topic_results),
+            'average_confidence': calculate_average_confidence(topic_results),
+            'missing_sections': [
+                result['section'] for result in topic_results
+                if result['source'] == 'fallback'
+            ]
+        })
+    
+    return create_response(200, {
+        'status': 'completed',
+        'batch_job_arn': job_arn,
+        'timestamp': now.isoformat(),
+        'topics': stored
+    })
+
+
+def s3_storage_disabled() -> bool:
+    """Return True when S3 reads and writes are switched off for local or test runs."""
+    return os.environ.get('RESEARCH_SKIP_S3') == '1' or not S3_BUCKET
+
+
 def calculate_average_confidence(results: List[Dict]) -> float:
     """
     Calculate average confidence score across all sections.
@@ -459,38 +1364,57 @@ def calculate_average_confidence(results: List[Dict]) -> float:
     Returns:
         Average confidence as float percentage
     """
-    if not results:
+    confidences = [item['confidence'] for item in results if 'confidence' in item]
+    if not confidences:
         return 0.0
     
-    total = sum(item.get('confidence', 0) for item in results)
-    return round(total / len(results), 1)
+    return round(sum(confidences) / len(confidences), 1)
 
 
-def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
+def create_response(status_code: int, body: Dict[str, Any], inline: bool = False) -> Dict[str, Any]:
     """
     Create standardized API Gateway response with CORS headers.
     
     Args:
         status_code: HTTP status code
         body: Response body data
+        inline: Leave body as an object for a direct invoke caller
     
     Returns:
         Formatted response dict for API Gateway
     """
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',  # Configure for production
-            'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key',
-            'Access-Control-Allow-Methods': 'POST,OPTIONS'
-        },
-        'body': json.dumps(body)
+        'headers': RESPONSE_HEADERS,
+        'body': body if inline else json_dumps(body).decode('utf-8')
     }
 
 
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to compact UTF-8 JSON bytes.
+    
+    Uses orjson when available, which is several times faster than the
+    stdlib encoder on large research payloads and produces bytes ready
+    for S3 and Bedrock request bodies.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse a JSON document from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # For local testing
 if __name__ == '__main__':
+    # Don't touch S3 from a dev machine (set RESEARCH_SKIP_S3=0 to keep it)
+    os.environ.setdefault('RESEARCH_SKIP_S3', '1')
+    
     # Sample test event
     test_event = {
         'body': json.dumps({
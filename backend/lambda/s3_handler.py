@@ -12,6 +12,7 @@ Author: Hackathon Team
 Version: 1.0.0
 """
 
+import gzip
 import json
 import os
 import boto3
@@ -19,6 +20,11 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
+
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -30,6 +36,16 @@ s3_client = boto3.client('s3')
 RESEARCH_BUCKET = os.environ.get('RESEARCH_BUCKET', 'ai-research-results')
 BOOKS_BUCKET = os.environ.get('BOOKS_BUCKET', 'ai-generated-books')
 PRESIGNED_URL_EXPIRATION = 3600  # 1 hour
+INLINE_RETRIEVE_LIMIT = 256 * 1024  # Larger objects are returned as a presigned URL
+REDIRECT_URL_EXPIRATION = 300  # Retrieve redirects are fetched right away
+GZIP_MIN_BYTES = 4096  # JSON payloads above this are stored gzip-encoded
+
+RESPONSE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type',
+    'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
+}
 
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -52,30 +68,24 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         API Gateway response
     """
     try:
-        logger.info(f"Processing S3 operation: {json.dumps(event)}")
+        logger.info(f"Processing S3 operation: {json_dumps(event).decode('utf-8')}")
         
         # Parse request
         if isinstance(event.get('body'), str):
-            body = json.loads(event['body'])
+            body = json_loads(event['body'])
         else:
             body = event
         
         operation = body.get('operation', '').lower()
         
         # Route to operation handler
-        if operation == 'upload':
-            return handle_upload(body)
-        elif operation == 'retrieve':
-            return handle_retrieve(body)
-        elif operation == 'list':
-            return handle_list(body)
-        elif operation == 'generate_url':
-            return handle_generate_url(body)
-        else:
+        handler = OPERATION_HANDLERS.get(operation)
+        if handler is None:
             return create_response(400, {
                 'error': 'Invalid operation',
-                'valid_operations': ['upload', 'retrieve', 'list', 'generate_url']
+                'valid_operations': VALID_OPERATIONS
             })
+        return handler(body)
             
     except Exception as e:
         logger.error(f"S3 operation error: {str(e)}", exc_info=True)
@@ -109,9 +119,13 @@ def handle_upload(body: Dict[str, Any]) -> Dict[str, Any]:
                 'error': 'Key and data are required'
             })
         
-        # Convert data to appropriate format
+        # Convert data to appropriate format (compact JSON, gzipped when large)
+        put_args = {}
         if isinstance(data, (dict, list)):
-            body_data = json.dumps(data, indent=2)
+            body_data = json_dumps(data)
+            if len(body_data) > GZIP_MIN_BYTES:
+                body_data = gzip.compress(body_data, compresslevel=1)
+                put_args['ContentEncoding'] = 'gzip'
         else:
             body_data = str(data)
         
@@ -121,7 +135,8 @@ def handle_upload(body: Dict[str, Any]) -> Dict[str, Any]:
             Key=key,
             Body=body_data,
             ContentType=content_type,
-            Metadata=metadata
+            Metadata=metadata,
+            **put_args
         )
         
         logger.info(f"Uploaded to S3: s3://{bucket}/{key}")
@@ -143,10 +158,14 @@ def handle_retrieve(body: Dict[str, Any]) -> Dict[str, Any]:
     """
     Retrieve file from S3.
     
-    Fetches object data and metadata from S3.
+    Fetches object data and metadata from S3. If the object is missing and
+    a fallback_key is given (e.g. a book's ".dup" double-write key), the
+    fallback is tried before returning 404. Objects larger than
+    INLINE_RETRIEVE_LIMIT are not proxied through Lambda; a presigned
+    download URL is returned instead.
     
     Args:
-        body: Request body with bucket and key
+        body: Request body with bucket, key and optional fallback_key
     
     Returns:
         Retrieved data and metadata
@@ -160,20 +179,45 @@ def handle_retrieve(body: Dict[str, Any]) -> Dict[str, Any]:
                 'error': 'Key is required'
             })
         
-        # Get object from S3
-        response = s3_client.get_object(
-            Bucket=bucket,
-            Key=key
-        )
+        # Get object from S3, falling back to the duplicate key on a miss
+        fallback_key = body.get('fallback_key')
+        try:
+            response = s3_client.get_object(
+                Bucket=bucket,
+                Key=key
+            )
+        except s3_client.exceptions.NoSuchKey:
+            if not fallback_key:
+                raise
+            logger.info(f"Primary key missing, trying fallback: {fallback_key}")
+            key = fallback_key
+            response = s3_client.get_object(
+                Bucket=bucket,
+                Key=key
+            )
         
-        # Read and parse data
-        data = response['Body'].read().decode('utf-8')
+        size = response.get('ContentLength', 0)
+        if size > INLINE_RETRIEVE_LIMIT:
+            response['Body'].close()
+            logger.info(f"Object too large to inline ({size} bytes), returning URL")
+            return create_response(200, {
+                'status': 'success',
+                'mode': 'redirect',
+                'bucket': bucket,
+                'key': key,
+                'size': size,
+                'url': presigned_get_url(bucket, key, REDIRECT_URL_EXPIRATION),
+                'expires_in': REDIRECT_URL_EXPIRATION
+            })
         
-        # Try to parse as JSON
+        # Parse JSON straight from bytes, falling back to text
+        raw = response['Body'].read()
+        if response.get('ContentEncoding') == 'gzip':
+            raw = gzip.decompress(raw)
         try:
-            parsed_data = json.loads(data)
-        except json.JSONDecodeError:
-            parsed_data = data
+            parsed_data = json_loads(raw)
+        except ValueError:
+            parsed_data = raw.decode('utf-8')
         
         logger.info(f"Retrieved from S3: s3://{bucket}/{key}")
         
@@ -202,8 +246,14 @@ def handle_list(body: Dict[str, Any]) -> Dict[str, Any]:
     """
     List objects in S3 bucket with optional prefix.
     
+    Pages through list_objects_v2 so listings are not cut off at S3's
+    1000-key page limit; max_keys caps the total number of objects. When
+    more remain, the response carries next_continuation_token, which can
+    be sent back as continuation_token to resume the listing.
+    
     Args:
-        body: Request body with bucket and prefix
+        body: Request body with bucket, prefix and optional delimiter
+            and continuation_token
     
     Returns:
         List of objects with metadata
@@ -212,34 +262,57 @@ def handle_list(body: Dict[str, Any]) -> Dict[str, Any]:
         bucket = body.get('bucket', RESEARCH_BUCKET)
         prefix = body.get('prefix', '')
         max_keys = body.get('max_keys', 100)
+        delimiter = body.get('delimiter')
         
-        # List objects
-        response = s3_client.list_objects_v2(
-            Bucket=bucket,
-            Prefix=prefix,
-            MaxKeys=max_keys
-        )
+        list_args = {'Bucket': bucket, 'Prefix': prefix}
+        if delimiter:
+            list_args['Delimiter'] = delimiter
+        token = body.get('continuation_token')
         
-        # Extract object information
+        # List objects across pages; each page is sized to what is still
+        # wanted, so truncation is exactly what S3 reports for the last page
         objects = []
-        for obj in response.get('Contents', []):
-            objects.append({
-                'key': obj['Key'],
-                'size': obj['Size'],
-                'last_modified': obj['LastModified'].isoformat(),
-                'etag': obj['ETag']
-            })
+        common_prefixes = []
+        remaining = max_keys
+        while True:
+            if token:
+                list_args['ContinuationToken'] = token
+            page = s3_client.list_objects_v2(**list_args, MaxKeys=min(remaining, 1000))
+            
+            # Extract object information (datetimes are serialized in create_response)
+            objects.extend(
+                {
+                    'key': obj['Key'],
+                    'size': obj['Size'],
+                    'last_modified': obj['LastModified'],
+                    'etag': obj['ETag']
+                }
+                for obj in page.get('Contents', [])
+            )
+            common_prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+            
+            # MaxKeys counts both objects and common prefixes
+            remaining -= page.get('KeyCount', 0)
+            token = page.get('NextContinuationToken') if page.get('IsTruncated') else None
+            if token is None or remaining <= 0:
+                break
         
         logger.info(f"Listed {len(objects)} objects from s3://{bucket}/{prefix}")
         
-        return create_response(200, {
+        result = {
             'status': 'success',
             'bucket': bucket,
             'prefix': prefix,
             'count': len(objects),
             'objects': objects,
-            'is_truncated': response.get('IsTruncated', False)
-        })
+            'is_truncated': token is not None
+        }
+        if token is not None:
+            result['next_continuation_token'] = token
+        if delimiter:
+            result['common_prefixes'] = common_prefixes
+        
+        return create_response(200, result)
         
     except Exception as e:
         logger.error(f"List failed: {str(e)}")
@@ -269,14 +342,7 @@ def handle_generate_url(body: Dict[str, Any]) -> Dict[str, Any]:
             })
         
         # Generate presigned URL
-        url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={
-                'Bucket': bucket,
-                'Key': key
-            },
-            ExpiresIn=expiration
-        )
+        url = presigned_get_url(bucket, key, expiration)
         
         logger.info(f"Generated presigned URL for s3://{bucket}/{key}")
         
@@ -296,20 +362,64 @@ def handle_generate_url(body: Dict[str, Any]) -> Dict[str, Any]:
         raise
 
 
+# Operation name -> handler, used by lambda_handler for dispatch
+OPERATION_HANDLERS = {
+    'upload': handle_upload,
+    'retrieve': handle_retrieve,
+    'list': handle_list,
+    'generate_url': handle_generate_url
+}
+VALID_OPERATIONS = list(OPERATION_HANDLERS)
+
+
+def presigned_get_url(bucket: str, key: str, expiration: int) -> str:
+    """Generate a presigned GET URL for an S3 object."""
+    return s3_client.generate_presigned_url(
+        'get_object',
+        Params={
+            'Bucket': bucket,
+            'Key': key
+        },
+        ExpiresIn=expiration
+    )
+
+
 def create_response(status_code: int, body: Dict[str, Any]) -> Dict[str, Any]:
     """Create standardized API Gateway response."""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type',
-            'Access-Control-Allow-Methods': 'GET,POST,OPTIONS'
-        },
-        'body': json.dumps(body)
+        'headers': RESPONSE_HEADERS,
+        'body': json_dumps(body).decode('utf-8')
     }
 
 
+def json_default(value: Any) -> str:
+    """Serialize values json can't handle natively (e.g. S3 datetimes)."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to compact UTF-8 JSON bytes.
+    
+    Uses orjson when available, which is several times faster than the
+    stdlib encoder and serializes datetimes natively; otherwise falls back
+    to json with json_default.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=json_default)
+    return json.dumps(data, separators=(',', ':'), default=json_default).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse a JSON document from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # For local testing
 if __name__ == '__main__':
     # Test upload
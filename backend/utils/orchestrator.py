@@ -15,20 +15,363 @@ Author: Hackathon Team
 Version: 1.0.0
 """
 
+import atexit
+import functools
 import json
+import multiprocessing
+import os
+import queue
+import re
 import boto3
 import logging
-from typing import Dict, List, Any, Optional
+import threading
+import time
+import uuid
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder when orjson is unavailable
+    orjson = None
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize AWS clients
-lambda_client = boto3.client('lambda')
-s3_client = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# AWS clients are built on first use and then shared by every orchestrator,
+# so importing this module costs nothing and code paths that never touch a
+# service don't pay for its client. Creation is serialized because boto3's
+# default session is not thread-safe while building clients.
+_client_lock = threading.Lock()
+
+# Connections in the shared Lambda client's pool; each synchronous invoke
+# holds one for its whole duration
+LAMBDA_POOL_CONNECTIONS = 64
+
+
+def build_lambda_client(max_pool_connections: int = LAMBDA_POOL_CONNECTIONS) -> Any:
+    """
+    Build a Lambda client with keep-alive connections. read_timeout must
+    outlast the slowest synchronous invoke (book-generator runs for up to
+    300s). Adaptive retries back off throttling (TooManyRequestsException)
+    and 5xx errors with jittered exponential delays and rate-limit the
+    client while throttled.
+    """
+    with _client_lock:
+        return boto3.client(
+            'lambda',
+            config=Config(
+                max_pool_connections=max_pool_connections,
+                retries={'max_attempts': 5, 'mode': 'adaptive'},
+                tcp_keepalive=True,
+                connect_timeout=2,
+                read_timeout=310
+            )
+        )
+
+
+@functools.cache
+def get_lambda():
+    """Lambda client shared across workflows so warm connections are reused."""
+    return build_lambda_client()
+
+
+@functools.cache
+def get_s3():
+    """S3 client for reading streamed research status objects."""
+    with _client_lock:
+        return boto3.client('s3', config=Config(tcp_keepalive=True))
+
+
+@functools.cache
+def get_dynamodb():
+    """DynamoDB resource for workflow history."""
+    with _client_lock:
+        return boto3.resource('dynamodb')
+
+
+@functools.cache
+def get_sfn():
+    """Step Functions client for state machine workflows."""
+    with _client_lock:
+        return boto3.client('stepfunctions')
+
+# Step Functions state machine that runs the workflow server-side (optional)
+STATE_MACHINE_ARN = os.environ.get('ORCHESTRATOR_STATE_MACHINE_ARN', '')
+
+# Alias or version to invoke (e.g. LIVE), where provisioned concurrency is
+# configured; the unqualified $LATEST is invoked when unset
+LAMBDA_QUALIFIER = os.environ.get('ORCHESTRATOR_LAMBDA_QUALIFIER', '')
+
+# Secondary book Lambda (e.g. one configured for Groq) tried when the primary
+# errors or times out; no fallback when unset
+FALLBACK_BOOK_LAMBDA = os.environ.get('FALLBACK_BOOK_LAMBDA', '')
+WARMUP_INTERVAL = 240.0  # seconds; idle Lambda containers are reclaimed after minutes
+
+# Polling of streamed research status objects (early_exit workflows)
+RESEARCH_POLL_INTERVAL = 0.5  # seconds
+RESEARCH_LAMBDA_TIMEOUT = 120.0  # seconds; research-handler's timeout in scripts/deploy-aws.sh
+# A run killed at its timeout may never write "failed", so stop waiting
+# shortly after the Lambda itself must have ended
+RESEARCH_STREAM_TIMEOUT = RESEARCH_LAMBDA_TIMEOUT + 10.0
+
+# DynamoDB table for workflow history (partition key "workflow_id"); history
+# is only logged when unset. Writes are buffered and sent with BatchWriteItem.
+WORKFLOW_HISTORY_TABLE = os.environ.get('WORKFLOW_HISTORY_TABLE', '')
+HISTORY_BATCH_SIZE = 25  # BatchWriteItem limit
+HISTORY_FLUSH_INTERVAL = 1.0  # seconds
+HISTORY_MAX_RETRIES = 5
+
+# Specificity check used by ProbabilityScorer._score_content_quality
+_DIGIT_RE = re.compile(r'\d')
+
+# Source model reliability used by ProbabilityScorer._score_source
+_SOURCE_SCORES = {
+    'bedrock': 95.0,  # AWS Bedrock is highly reliable
+    'groq': 88.0,     # Groq is fast and good
+    'fallback': 70.0  # Fallback content
+}
+
+# Batches smaller than this are scored in-process; pickling items to worker
+# processes costs more than scoring a few sections
+SCORING_PARALLEL_THRESHOLD = 64
+
+# Largest research batch; the research handler runs this many topics at once
+# (MAX_PARALLEL_TOPICS), so a batch takes about as long as one topic
+RESEARCH_BATCH_MAX = 8
+
+
+@lru_cache(maxsize=1024)
+def _lower_topic(topic: str) -> str:
+    """Lowercase a topic once; batches score many sections of the same topic."""
+    return topic.lower()
+
+
+class WorkflowHistoryWriter:
+    """
+    Buffers workflow history items and writes them to DynamoDB in batches.
+    
+    A daemon thread flushes the buffer every HISTORY_FLUSH_INTERVAL seconds,
+    or as soon as a full batch of 25 items is queued, so storing history
+    never blocks a workflow. Unprocessed items are retried with exponential
+    backoff, and the buffer is flushed on interpreter exit.
+    """
+    
+    def __init__(self, table_name: str):
+        self.table_name = table_name
+        self._buffer = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='workflow-history', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def add(self, item: Dict[str, Any]) -> None:
+        """Queue an item for the next batch write."""
+        # DynamoDB rejects floats; round-trip through JSON to get Decimals
+        item = json.loads(json.dumps(item), parse_float=Decimal)
+        
+        # Store section confidences as one binary attribute rather than a
+        # Number per section; dequantize_confidences reads them back
+        research = item.get('research', {}).get('data', {})
+        results = research.get('results')
+        if results:
+            research['confidences_q'] = quantize_confidences(
+                result.pop('confidence', 0) for result in results
+            )
+        
+        self._buffer.append(item)
+        if len(self._buffer) >= HISTORY_BATCH_SIZE:
+            self._wake.set()
+    
+    def flush(self) -> None:
+        """Write every buffered item, HISTORY_BATCH_SIZE at a time."""
+        while self._buffer:
+            batch = []
+            while self._buffer and len(batch) < HISTORY_BATCH_SIZE:
+                batch.append(self._buffer.popleft())
+            self._write_batch(batch)
+    
+    def close(self) -> None:
+        """Stop the flush thread after writing what is still buffered."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=10)
+    
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(HISTORY_FLUSH_INTERVAL)
+            self._wake.clear()
+            self.flush()
+        self.flush()
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> None:
+        request = {
+            self.table_name: [{'PutRequest': {'Item': item}} for item in batch]
+        }
+        try:
+            for attempt in range(HISTORY_MAX_RETRIES):
+                response = get_dynamodb().batch_write_item(RequestItems=request)
+                request = response.get('UnprocessedItems') or {}
+                if not request:
+                    return
+                time.sleep(min(0.05 * 2 ** attempt, 2.0))
+            
+            dropped = len(request.get(self.table_name, []))
+            logger.warning(f"Dropped {dropped} workflow history items after retries")
+        except Exception as e:
+            logger.warning(f"Failed to store workflow history: {str(e)}")
+
+
+def quantize_confidences(confidences: Any) -> bytes:
+    """Pack 0-100% confidences at half-point precision, one byte each."""
+    return bytes(min(200, max(0, round(c * 2))) for c in confidences)
+
+
+def dequantize_confidences(data: bytes) -> List[float]:
+    """Unpack confidences stored by quantize_confidences."""
+    return [q / 2 for q in data]
+
+
+class LambdaWarmer:
+    """
+    Keeps Lambda containers warm with periodic no-op invocations.
+    
+    A daemon thread sends {"warmup": true} as an Event invocation to each
+    function every interval seconds; the handlers return immediately on
+    that event. This covers functions without provisioned concurrency,
+    where the book Lambda is otherwise cold whenever research ran first.
+    """
+    
+    def __init__(self, client: Any, function_names: List[str], interval: float = WARMUP_INTERVAL):
+        self.client = client
+        self.function_names = function_names
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='lambda-warmer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def warm(self) -> None:
+        """Send one warmup invocation to every function."""
+        for function_name in self.function_names:
+            try:
+                self.client.invoke(
+                    FunctionName=function_name,
+                    InvocationType='Event',
+                    Payload=b'{"warmup":true}'
+                )
+            except Exception as e:
+                logger.warning(f"Warmup of {function_name} failed: {str(e)}")
+    
+    def close(self) -> None:
+        """Stop sending warmup invocations."""
+        self._stop.set()
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.warm()
+            self._stop.wait(self.interval)
+
+
+class ResearchBatcher:
+    """
+    Coalesces concurrent research requests into multi-topic invocations.
+    
+    Requests are queued and a daemon thread collects them into batches of
+    up to batch_max, waiting at most batch_timeout_ms after the first one.
+    Under light load a batch holds a single request and is sent as an
+    ordinary invocation; as traffic builds, more requests arrive within
+    the window and batches grow, cutting the number of Lambda calls.
+    Batches are dispatched on a small pool so collection never waits on
+    a batch in flight. Both are stopped on interpreter exit.
+    """
+    
+    def __init__(
+        self,
+        invoke_one: Callable[[str, str], Dict[str, Any]],
+        invoke_many: Callable[[List[Tuple[str, str]]], List[Dict[str, Any]]],
+        batch_max: int = 8,
+        batch_timeout_ms: float = 20
+    ):
+        self.invoke_one = invoke_one
+        self.invoke_many = invoke_many
+        self.batch_max = batch_max
+        self.batch_timeout = batch_timeout_ms / 1000
+        self._queue = queue.Queue()
+        self._dispatcher = ThreadPoolExecutor(max_workers=4)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='research-batcher', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+    
+    def submit(self, topic: str, user_id: str) -> Future:
+        """Queue a research request; the future resolves to its invoke result."""
+        if self._closed:
+            raise RuntimeError("ResearchBatcher is closed")
+        future = Future()
+        self._queue.put((topic, user_id, future))
+        return future
+    
+    def close(self) -> None:
+        """Dispatch what is still queued, then stop the collector and pool."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        self._dispatcher.shutdown(wait=True)
+    
+    def _run(self) -> None:
+        while True:
+            request = self._queue.get()
+            if request is None:
+                return
+            batch = [request]
+            deadline = time.monotonic() + self.batch_timeout
+            while len(batch) < self.batch_max:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    self._submit_batch(batch)
+                    return
+                batch.append(request)
+            self._submit_batch(batch)
+    
+    def _submit_batch(self, batch: List[Tuple[str, str, Future]]) -> None:
+        try:
+            self._dispatcher.submit(self._dispatch, batch)
+        except RuntimeError:
+            # The pool refuses new work once the interpreter is shutting down
+            self._dispatch(batch)
+    
+    def _dispatch(self, batch: List[Tuple[str, str, Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                topic, user_id, _ = batch[0]
+                results = [self.invoke_one(topic, user_id)]
+            else:
+                results = self.invoke_many([(topic, user_id) for topic, user_id, _ in batch])
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
 
 
 class ResearchOrchestrator:
@@ -46,7 +389,15 @@ class ResearchOrchestrator:
         self,
         research_lambda: str = 'research-handler',
         book_lambda: str = 'book-generator',
-        min_confidence: float = 70.0
+        min_confidence: float = 70.0,
+        max_workers: int = 8,
+        client: Optional[Any] = None,
+        state_machine_arn: str = STATE_MACHINE_ARN,
+        qualifier: str = LAMBDA_QUALIFIER,
+        fallback_book_lambda: str = FALLBACK_BOOK_LAMBDA,
+        warmup_interval: float = 0,
+        batch_max: int = 1,
+        batch_timeout_ms: float = 20
     ):
         """
         Initialize orchestrator with Lambda function names.
@@ -55,18 +406,71 @@ class ResearchOrchestrator:
             research_lambda: Name of research generation Lambda
             book_lambda: Name of book generation Lambda
             min_confidence: Minimum confidence threshold for accepting results
+            max_workers: Workflows run concurrently by process_research_requests;
+                above LAMBDA_POOL_CONNECTIONS the orchestrator gets its own
+                Lambda client with a pool to match
+            client: Lambda client to invoke with (defaults to get_lambda())
+            state_machine_arn: Step Functions workflow used by start_workflow
+            qualifier: Alias or version of both Lambdas to invoke (e.g. LIVE)
+            fallback_book_lambda: Book Lambda tried when the primary errors
+            warmup_interval: Seconds between warmup invocations (0 disables)
+            batch_max: Most research requests coalesced into one invocation
+                (1 disables batching, capped at RESEARCH_BATCH_MAX)
+            batch_timeout_ms: How long a request waits for others to join it
         """
+        # Every in-flight invoke pins a pooled connection; past the pool size,
+        # boto3 discards the extra connections instead of keeping them alive
+        if client is None and max_workers > LAMBDA_POOL_CONNECTIONS:
+            client = build_lambda_client(max_workers)
+        self._lambda_client = client
+        # Retries botocore made for the workflow running on this thread
+        self._retries = threading.local()
         self.research_lambda = research_lambda
         self.book_lambda = book_lambda
         self.min_confidence = min_confidence
+        self.state_machine_arn = state_machine_arn
+        self.qualifier = qualifier
+        self.fallback_book_lambda = fallback_book_lambda
+        self._warmer = (
+            LambdaWarmer(
+                self.lambda_client,
+                [self._qualified(research_lambda), self._qualified(book_lambda)],
+                warmup_interval
+            ) if warmup_interval > 0 else None
+        )
+        # Batching trades a few ms of queueing for fewer invocations, so it
+        # is opt-in for cost-bound workloads
+        self._batcher = (
+            ResearchBatcher(
+                self._invoke_research_counted,
+                self._invoke_research_batch,
+                min(batch_max, RESEARCH_BATCH_MAX),
+                batch_timeout_ms
+            ) if batch_max > 1 else None
+        )
+        self._history = (
+            WorkflowHistoryWriter(WORKFLOW_HISTORY_TABLE) if WORKFLOW_HISTORY_TABLE else None
+        )
+        
+        # Shared pool for concurrent workflows; each one is bound by Lambda
+        # round-trips, so threads overlap the waiting
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
         
         logger.info(f"Orchestrator initialized with min confidence: {min_confidence}%")
     
+    @property
+    def lambda_client(self) -> Any:
+        """Injected Lambda client, or the shared one built on first use."""
+        return self._lambda_client or get_lambda()
+    
     def process_research_request(
         self,
         topic: str,
         user_id: str,
-        generate_book: bool = True
+        generate_book: bool = True,
+        wait_for_book: bool = True,
+        include_metrics: bool = True,
+        early_exit: bool = False
     ) -> Dict[str, Any]:
         """
         Process complete research request with optional book generation.
@@ -77,21 +481,44 @@ class ResearchOrchestrator:
         3. Optionally generates book if quality is sufficient
         4. Returns aggregated results
         
+        The book depends on the research output, so the two invocations
+        cannot overlap; with wait_for_book=False the book Lambda is invoked
+        asynchronously and the workflow returns as soon as research is
+        validated, with the book reported as queued.
+        
+        With include_metrics=False only the accept/reject decision is made,
+        which can stop scanning sections as soon as it is settled, and the
+        research result carries no quality_metrics.
+        
+        With early_exit=True research is requested in streamed mode and its
+        sections are read as they complete; once the remaining sections can
+        no longer lift the research over the quality bar, the workflow stops
+        waiting and returns the partial research without a book.
+        
         Args:
             topic: Research topic
             user_id: User identifier
             generate_book: Whether to generate book from research
+            wait_for_book: Block until the book is generated
+            include_metrics: Report the full confidence breakdown
+            early_exit: Reject as soon as the quality bar is out of reach
         
         Returns:
             Complete workflow results with status and data
         """
         logger.info(f"Processing research request for topic: {topic}")
         
-        workflow_id = f"{user_id}_{int(datetime.utcnow().timestamp())}"
+        workflow_id = new_workflow_id(user_id)
+        self._take_retries()
         
         try:
             # Step 1: Generate research
-            research_result = self._invoke_research_lambda(topic, user_id)
+            if early_exit:
+                research_result = self._invoke_research_streamed(topic, user_id)
+            elif self._batcher is not None:
+                research_result = self._batcher.submit(topic, user_id).result()
+            else:
+                research_result = self._invoke_research_lambda(topic, user_id)
             
             if not research_result['success']:
                 return {
@@ -103,39 +530,53 @@ class ResearchOrchestrator:
             
             # Step 2: Validate confidence scores
             research_data = research_result['data']
-            validation = self._validate_research_quality(research_data)
-            
-            logger.info(f"Research quality: {validation['average_confidence']}% "
-                       f"({validation['high_confidence_count']}/{validation['total_sections']} sections)")
+            validation = None
+            if include_metrics:
+                validation = self._validate_research_quality(research_data)
+                acceptable = validation['acceptable']
+                
+                logger.info(f"Research quality: {validation['average_confidence']}% "
+                           f"({validation['high_confidence_count']}/{validation['total_sections']} sections)")
+            else:
+                acceptable = self._is_acceptable(research_data.get('results', []))
             
             # Step 3: Decide on book generation based on quality
             book_result = None
-            if generate_book and validation['acceptable']:
+            if generate_book and acceptable:
                 logger.info("Quality threshold met, generating book...")
                 book_result = self._invoke_book_lambda(
                     topic=topic,
                     research_data=research_data['results'],
-                    user_id=user_id
+                    user_id=user_id,
+                    invocation_type='RequestResponse' if wait_for_book else 'Event'
                 )
             elif generate_book:
                 logger.warning(f"Quality below threshold "
-                             f"({validation['average_confidence']}% < {self.min_confidence}%), "
-                             f"skipping book generation")
+                             f"(min {self.min_confidence}%), skipping book generation")
             
             # Step 4: Aggregate and return results
+            # Batched research ran on the batcher's thread and reports its own
+            lambda_retries = self._take_retries() + research_result.get('retries', 0)
+            if lambda_retries:
+                logger.warning(f"Workflow {workflow_id} needed {lambda_retries} Lambda retries")
+            
+            research = {
+                'status': 'rejected_early' if research_result.get('early_exit') else 'success',
+                'data': research_data
+            }
+            if validation is not None:
+                research['quality_metrics'] = validation
+            
             workflow_result = {
                 'workflow_id': workflow_id,
                 'status': 'completed',
                 'topic': topic,
                 'timestamp': datetime.utcnow().isoformat(),
-                'research': {
-                    'status': 'success',
-                    'data': research_data,
-                    'quality_metrics': validation
-                },
+                'lambda_retries': lambda_retries,
+                'research': research,
                 'book': book_result if book_result else {
                     'status': 'skipped',
-                    'reason': 'Quality threshold not met' if not validation['acceptable'] else 'Not requested'
+                    'reason': 'Quality threshold not met' if not acceptable else 'Not requested'
                 }
             }
             
@@ -154,6 +595,162 @@ class ResearchOrchestrator:
                 'timestamp': datetime.utcnow().isoformat()
             }
     
+    def start_workflow(
+        self,
+        topic: str,
+        user_id: str,
+        generate_book: bool = True,
+        wait: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Run the workflow in the Step Functions state machine.
+        
+        Unlike process_research_request, no thread is held open while the
+        Lambdas run: the execution is started and its ARN returned at once.
+        With wait=True the call blocks on start_sync_execution, which
+        requires an Express state machine.
+        
+        Args:
+            topic: Research topic
+            user_id: User identifier
+            generate_book: Whether to generate book from research
+            wait: Block until the execution finishes (Express workflows only)
+        
+        Returns:
+            Execution ARN and status, plus the output when wait=True
+        """
+        if not self.state_machine_arn:
+            raise ValueError("ORCHESTRATOR_STATE_MACHINE_ARN must be set to start workflows")
+        
+        workflow_id = new_workflow_id(user_id)
+        # Execution names must be unique per state machine (for 90 days on
+        # Standard workflows) and are limited to 80 characters, so they are
+        # not derived from the user ID
+        execution_name = uuid.uuid4().hex
+        execution_input = json_dumps({
+            'topic': topic,
+            'user_id': user_id,
+            'generate_book': generate_book
+        })
+        
+        if wait:
+            response = get_sfn().start_sync_execution(
+                stateMachineArn=self.state_machine_arn,
+                name=execution_name,
+                input=execution_input.decode('utf-8')
+            )
+            return {
+                'workflow_id': workflow_id,
+                'execution_arn': response['executionArn'],
+                'status': response['status'].lower(),
+                'output': json_loads(response.get('output') or '{}')
+            }
+        
+        response = get_sfn().start_execution(
+            stateMachineArn=self.state_machine_arn,
+            name=execution_name,
+            input=execution_input.decode('utf-8')
+        )
+        
+        logger.info(f"Started workflow execution: {workflow_id}")
+        return {
+            'workflow_id': workflow_id,
+            'execution_arn': response['executionArn'],
+            'status': 'running'
+        }
+    
+    def create_state_machine(
+        self,
+        name: str,
+        role_arn: str,
+        express: bool = False
+    ) -> str:
+        """
+        Create the workflow state machine for this orchestrator's Lambdas.
+        
+        The Lambdas are invoked at the orchestrator's qualifier, so the state
+        machine hits the same (e.g. provisioned) alias as process_research_request.
+        
+        Args:
+            name: State machine name
+            role_arn: IAM role Step Functions assumes to invoke the Lambdas
+            express: Create an Express workflow (needed for start_workflow(wait=True))
+        
+        Returns:
+            ARN of the new state machine, also set on this orchestrator
+        """
+        response = get_sfn().create_state_machine(
+            name=name,
+            roleArn=role_arn,
+            type='EXPRESS' if express else 'STANDARD',
+            definition=json.dumps(build_state_machine_definition(
+                self._qualified(self.research_lambda),
+                self._qualified(self.book_lambda),
+                self.min_confidence
+            ))
+        )
+        self.state_machine_arn = response['stateMachineArn']
+        return self.state_machine_arn
+    
+    def configure_provisioned_concurrency(self, concurrency: int = 2) -> None:
+        """
+        Keep initialized instances of both Lambdas ready at the qualifier.
+        
+        Provisioned concurrency applies to an alias or version, so the
+        orchestrator must have a qualifier; requests beyond the provisioned
+        instances still run on demand.
+        
+        Args:
+            concurrency: Instances to keep initialized per function
+        """
+        if not self.qualifier:
+            raise ValueError("A Lambda qualifier is required for provisioned concurrency")
+        
+        for function_name in (self.research_lambda, self.book_lambda):
+            self.lambda_client.put_provisioned_concurrency_config(
+                FunctionName=function_name,
+                Qualifier=self.qualifier,
+                ProvisionedConcurrentExecutions=concurrency
+            )
+            logger.info(f"Provisioned {concurrency} instances of "
+                       f"{function_name}:{self.qualifier}")
+    
+    def process_research_requests(
+        self,
+        topics: List[str],
+        user_id: str,
+        generate_book: bool = True,
+        wait_for_book: bool = True,
+        include_metrics: bool = True,
+        early_exit: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Process several research requests concurrently.
+        
+        Each topic runs the full process_research_request workflow on the
+        shared executor, so total latency approaches that of the slowest
+        workflow rather than the sum of all of them.
+        
+        Args:
+            topics: Research topics
+            user_id: User identifier
+            generate_book: Whether to generate books from research
+            wait_for_book: Block until each book is generated
+            include_metrics: Report the full confidence breakdown
+            early_exit: Reject as soon as the quality bar is out of reach
+        
+        Returns:
+            Workflow results in the same order as topics
+        """
+        futures = [
+            self._executor.submit(
+                self.process_research_request,
+                topic, user_id, generate_book, wait_for_book, include_metrics, early_exit
+            )
+            for topic in topics
+        ]
+        return [future.result() for future in futures]
+    
     def _invoke_research_lambda(self, topic: str, user_id: str) -> Dict[str, Any]:
         """
         Invoke research generation Lambda function.
@@ -166,35 +763,34 @@ class ResearchOrchestrator:
             Lambda invocation result
         """
         try:
+            # Both Lambdas accept the request object itself as the event,
+            # so the payload is encoded once rather than nested in a body string
             payload = {
-                'body': json.dumps({
-                    'topic': topic,
-                    'user_id': user_id
-                })
+                'topic': topic,
+                'user_id': user_id,
+                'inline_body': True
             }
             
             logger.info(f"Invoking research Lambda: {self.research_lambda}")
             
-            response = lambda_client.invoke(
-                FunctionName=self.research_lambda,
+            response = self._invoke(
+                FunctionName=self._qualified(self.research_lambda),
                 InvocationType='RequestResponse',
-                Payload=json.dumps(payload)
+                Payload=json_dumps(payload)
             )
             
             # Parse Lambda response
-            result = json.loads(response['Payload'].read())
+            status_code, body = parse_invoke_response(response)
             
-            if result['statusCode'] == 200:
-                body = json.loads(result['body'])
+            if status_code == 200:
                 return {
                     'success': True,
                     'data': body
                 }
             else:
-                error_body = json.loads(result['body'])
                 return {
                     'success': False,
-                    'error': error_body.get('error', 'Unknown error')
+                    'error': body.get('error', 'Unknown error')
                 }
                 
         except Exception as e:
@@ -204,54 +800,227 @@ class ResearchOrchestrator:
                 'error': str(e)
             }
     
+    def _invoke_research_counted(self, topic: str, user_id: str) -> Dict[str, Any]:
+        """_invoke_research_lambda for the batcher, carrying its retry count."""
+        result = self._invoke_research_lambda(topic, user_id)
+        result['retries'] = self._take_retries()
+        return result
+    
+    def _invoke_research_streamed(self, topic: str, user_id: str) -> Dict[str, Any]:
+        """
+        Run research in streamed mode, stopping once it is certain to be rejected.
+        
+        The research Lambda accepts a streamed request with 202 and rewrites
+        a status object in S3 as sections complete. That object is polled,
+        and the partial confidences are checked against the quality rule
+        after every update. The Lambda itself runs to completion; only the
+        wait is cut short.
+        
+        Args:
+            topic: Research topic
+            user_id: User identifier
+        
+        Returns:
+            Lambda invocation result; 'early_exit' is set when the data is
+            partial because the research could no longer be accepted
+        """
+        try:
+            response = self._invoke(
+                FunctionName=self._qualified(self.research_lambda),
+                InvocationType='RequestResponse',
+                Payload=json_dumps({
+                    'topic': topic,
+                    'user_id': user_id,
+                    'stream': True,
+                    'inline_body': True
+                })
+            )
+            status_code, job = parse_invoke_response(response)
+            if status_code != 202:
+                return {
+                    'success': False,
+                    'error': job.get('error', 'Unknown error')
+                }
+            
+            logger.info(f"Streaming research job: {job['job_id']}")
+            
+            deadline = time.monotonic() + RESEARCH_STREAM_TIMEOUT
+            while time.monotonic() < deadline:
+                time.sleep(RESEARCH_POLL_INTERVAL)
+                status = json_loads(get_s3().get_object(
+                    Bucket=job['status_bucket'],
+                    Key=job['status_key']
+                )['Body'].read())
+                result = status.get('result', {})
+                
+                if status['status'] == 'completed':
+                    return {'success': True, 'data': result}
+                if status['status'] == 'failed':
+                    return {
+                        'success': False,
+                        'error': result.get('message', 'Unknown error')
+                    }
+                
+                results = result.get('results', [])
+                total = result.get('total_sections', 0)
+                if results and total:
+                    confidences = [item.get('confidence', 0) for item in results]
+                    decision = self._settled_decision(
+                        sum(confidences),
+                        sum(1 for c in confidences if c >= 85),
+                        total - len(results),
+                        total
+                    )
+                    if decision is False:
+                        logger.info(f"Research for {topic} cannot meet the quality "
+                                   f"threshold after {len(results)}/{total} sections")
+                        return {'success': True, 'data': result, 'early_exit': True}
+            
+            return {
+                'success': False,
+                'error': f"Research job {job['job_id']} timed out"
+            }
+            
+        except Exception as e:
+            logger.error(f"Streamed research invocation failed: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _invoke_research_batch(self, requests: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        Invoke the research Lambda once for several (topic, user_id) requests.
+        
+        Args:
+            requests: Topic and user identifier of each request
+        
+        Returns:
+            One _invoke_research_lambda-style result per request, in order
+        """
+        try:
+            payload = {
+                'operation': 'research_many',
+                'requests': [
+                    {'topic': topic, 'user_id': user_id, 'inline_body': True}
+                    for topic, user_id in requests
+                ],
+                'inline_body': True
+            }
+            
+            logger.info(f"Invoking research Lambda for {len(requests)} topics: {self.research_lambda}")
+            
+            response = self._invoke(
+                FunctionName=self._qualified(self.research_lambda),
+                InvocationType='RequestResponse',
+                Payload=json_dumps(payload)
+            )
+            
+            status_code, body = parse_invoke_response(response)
+            if status_code != 200:
+                raise RuntimeError(body.get('error', 'Unknown error'))
+            
+            # The retries belong to the one shared invocation, so they are
+            # credited to the first request only rather than to each of them
+            retries = self._take_retries()
+            results = []
+            for item in body['responses']:
+                item_body = decode_body(item['body'])
+                if item['statusCode'] == 200:
+                    results.append({'success': True, 'data': item_body, 'retries': retries})
+                else:
+                    results.append({
+                        'success': False,
+                        'error': item_body.get('error', 'Unknown error'),
+                        'retries': retries
+                    })
+                retries = 0
+            return results
+            
+        except Exception as e:
+            logger.error(f"Research Lambda batch invocation failed: {str(e)}")
+            retries = self._take_retries()
+            return [
+                {'success': False, 'error': str(e), 'retries': retries if index == 0 else 0}
+                for index in range(len(requests))
+            ]
+    
     def _invoke_book_lambda(
         self,
         topic: str,
         research_data: List[Dict],
-        user_id: str
+        user_id: str,
+        invocation_type: str = 'RequestResponse'
     ) -> Dict[str, Any]:
         """
         Invoke book generation Lambda function.
         
+        If the book Lambda errors or times out and a fallback Lambda is
+        configured, the request is retried once on the fallback.
+        
         Args:
             topic: Book topic
             research_data: Research insights
             user_id: User identifier
+            invocation_type: 'RequestResponse' to wait for the book, or
+                'Event' to queue it and return immediately
         
         Returns:
             Book generation result
         """
+        payload = json_dumps({
+            'topic': topic,
+            'research_data': research_data,
+            'book_title': f"Comprehensive Guide to {topic}",
+            'user_id': user_id,
+            'inline_body': True
+        })
+        
+        result = self._invoke_book_function(
+            self._qualified(self.book_lambda), payload, invocation_type
+        )
+        if result['status'] == 'error' and self.fallback_book_lambda:
+            logger.warning(f"Book Lambda failed, falling back to {self.fallback_book_lambda}")
+            result = self._invoke_book_function(
+                self.fallback_book_lambda, payload, invocation_type
+            )
+        return result
+    
+    def _invoke_book_function(
+        self,
+        function_name: str,
+        payload: bytes,
+        invocation_type: str
+    ) -> Dict[str, Any]:
+        """Invoke one book Lambda with an encoded request payload."""
         try:
-            payload = {
-                'body': json.dumps({
-                    'topic': topic,
-                    'research_data': research_data,
-                    'book_title': f"Comprehensive Guide to {topic}",
-                    'user_id': user_id
-                })
-            }
-            
-            logger.info(f"Invoking book Lambda: {self.book_lambda}")
+            logger.info(f"Invoking book Lambda: {function_name}")
             
-            response = lambda_client.invoke(
-                FunctionName=self.book_lambda,
-                InvocationType='RequestResponse',
-                Payload=json.dumps(payload)
+            response = self._invoke(
+                FunctionName=function_name,
+                InvocationType=invocation_type,
+                Payload=payload
             )
             
-            result = json.loads(response['Payload'].read())
+            # Event invocations are only acknowledged; the book Lambda
+            # stores the book in S3 when it finishes
+            if invocation_type == 'Event':
+                return {
+                    'status': 'queued' if response['StatusCode'] == 202 else 'failed',
+                    'function': function_name
+                }
             
-            if result['statusCode'] == 200:
-                body = json.loads(result['body'])
+            status_code, body = parse_invoke_response(response)
+            
+            if status_code == 200:
                 return {
                     'status': 'success',
                     'data': body
                 }
             else:
-                error_body = json.loads(result['body'])
                 return {
                     'status': 'failed',
-                    'error': error_body.get('error', 'Unknown error')
+                    'error': body.get('error', 'Unknown error')
                 }
                 
         except Exception as e:
@@ -261,6 +1030,38 @@ class ResearchOrchestrator:
                 'error': str(e)
             }
     
+    def _invoke(self, **kwargs: Any) -> Dict[str, Any]:
+        """
+        Invoke a Lambda, counting the retries botocore made along the way.
+        
+        Throttles and transient errors are retried inside the client; the
+        count is read from the response metadata (or the final error) and
+        added to this thread's workflow so throttle pressure shows up in
+        the workflow record.
+        """
+        try:
+            response = self.lambda_client.invoke(**kwargs)
+        except ClientError as e:
+            self._count_retries(e.response)
+            raise
+        self._count_retries(response)
+        return response
+    
+    def _count_retries(self, response: Dict[str, Any]) -> None:
+        retries = response.get('ResponseMetadata', {}).get('RetryAttempts', 0)
+        if retries:
+            self._retries.count = getattr(self._retries, 'count', 0) + retries
+    
+    def _take_retries(self) -> int:
+        """Return and reset the retry count of this thread's workflow."""
+        retries = getattr(self._retries, 'count', 0)
+        self._retries.count = 0
+        return retries
+    
+    def _qualified(self, function_name: str) -> str:
+        """Return function_name with the configured alias or version, if any."""
+        return f"{function_name}:{self.qualifier}" if self.qualifier else function_name
+    
     def _validate_research_quality(self, research_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Validate research quality based on confidence scores.
@@ -284,10 +1085,20 @@ class ResearchOrchestrator:
                 'high_confidence_count': 0
             }
         
-        confidences = [item.get('confidence', 0) for item in results]
-        average = sum(confidences) / len(confidences)
-        high_confidence = sum(1 for c in confidences if c >= 85)
-        
+        # Tally every statistic in one pass over the sections
+        total = 0
+        high_confidence = medium_confidence = low_confidence = 0
+        for item in results:
+            c = item.get('confidence', 0)
+            total += c
+            if c >= 85:
+                high_confidence += 1
+            elif c >= 70:
+                medium_confidence += 1
+            else:
+                low_confidence += 1
+        average = total / len(results)
+
         # Decision logic: Accept if average meets threshold AND
         # at least 50% of sections have high confidence
         acceptable = (
@@ -302,33 +1113,197 @@ class ResearchOrchestrator:
             'high_confidence_count': high_confidence,
             'confidence_distribution': {
                 'high (>=85%)': high_confidence,
-                'medium (70-84%)': sum(1 for c in confidences if 70 <= c < 85),
-                'low (<70%)': sum(1 for c in confidences if c < 70)
+                'medium (70-84%)': medium_confidence,
+                'low (<70%)': low_confidence
             }
         }
     
+    def _is_acceptable(self, results: List[Dict[str, Any]]) -> bool:
+        """
+        Apply the _validate_research_quality decision without the breakdown.
+        
+        Confidences are percentages (0-100), so scanning stops as soon as
+        the remaining sections can no longer change the outcome.
+        
+        Args:
+            results: Research sections with confidence scores
+        
+        Returns:
+            Whether the research is good enough for book generation
+        """
+        total = len(results)
+        if not total:
+            return False
+        
+        confidence_sum = 0
+        high_confidence = 0
+        for i, item in enumerate(results, 1):
+            c = item.get('confidence', 0)
+            confidence_sum += c
+            if c >= 85:
+                high_confidence += 1
+            
+            decision = self._settled_decision(confidence_sum, high_confidence, total - i, total)
+            if decision is not None:
+                return decision
+        
+        return False
+    
+    def _settled_decision(
+        self,
+        confidence_sum: float,
+        high_confidence: int,
+        remaining: int,
+        total: int
+    ) -> Optional[bool]:
+        """
+        Decide acceptance from the sections seen so far, if already settled.
+        
+        Args:
+            confidence_sum: Sum of the confidences seen
+            high_confidence: Sections seen at 85% or above
+            remaining: Sections not yet seen
+            total: Sections in the full result
+        
+        Returns:
+            True or False once the remaining sections (each 0-100%) can't
+            change the outcome, otherwise None
+        """
+        min_sum = self.min_confidence * total
+        min_high = total * 0.5
+        if confidence_sum >= min_sum and high_confidence >= min_high:
+            return True
+        if (confidence_sum + 100 * remaining < min_sum or
+                high_confidence + remaining < min_high):
+            return False
+        return None
+    
     def _store_workflow_history(self, workflow_data: Dict[str, Any]) -> None:
         """
         Store workflow execution history in DynamoDB.
         
         This provides audit trail and analytics for the autonomous system.
+        Items are queued for a batched background write, so this returns
+        immediately; without WORKFLOW_HISTORY_TABLE history is only logged.
         
         Args:
             workflow_data: Complete workflow execution data
         """
         try:
-            # Note: This requires a DynamoDB table to be created
-            # For demo purposes, we'll log instead
             logger.info(f"Workflow history: {workflow_data['workflow_id']}")
             
-            # In production, uncomment:
-            # table = dynamodb.Table('research-workflows')
-            # table.put_item(Item=workflow_data)
+            if self._history is not None:
+                self._history.add(workflow_data)
             
         except Exception as e:
             logger.warning(f"Failed to store workflow history: {str(e)}")
 
 
+def build_state_machine_definition(
+    research_lambda: str,
+    book_lambda: str,
+    min_confidence: float
+) -> Dict[str, Any]:
+    """
+    Build the Amazon States Language definition of the workflow.
+    
+    Mirrors process_research_request: invoke research, apply the same
+    quality rule as _validate_research_quality (average confidence at the
+    threshold and at least half the sections >= 85%), then invoke the book
+    Lambda if requested. A failed book Lambda is recorded in the output
+    rather than failing the execution. Uses JSONata so the Lambdas' JSON
+    string bodies can be parsed and scored without an extra Task.
+    
+    Args:
+        research_lambda: Name or ARN of the research Lambda, optionally
+            qualified with an alias or version (name:alias)
+        book_lambda: Name or ARN of the book Lambda, optionally qualified
+        min_confidence: Minimum average confidence for book generation
+    
+    Returns:
+        State machine definition, ready to json.dumps
+    """
+    acceptable = (
+        "$count($results) > 0"
+        f" and $average($results.confidence) >= {min_confidence}"
+        " and $count($results[confidence >= 85]) >= $count($results) * 0.5"
+    )
+    
+    return {
+        'Comment': 'AI research and book generation workflow',
+        'QueryLanguage': 'JSONata',
+        'StartAt': 'InvokeResearch',
+        'States': {
+            'InvokeResearch': {
+                'Type': 'Task',
+                'Resource': 'arn:aws:states:::lambda:invoke',
+                'Arguments': {
+                    'FunctionName': research_lambda,
+                    'Payload': {
+                        'body': "{% $string({'topic': $states.input.topic, "
+                                "'user_id': $states.input.user_id}) %}"
+                    }
+                },
+                'Assign': {'request': '{% $states.input %}'},
+                'Output': '{% $states.result.Payload %}',
+                'Next': 'CheckResearch'
+            },
+            'CheckResearch': {
+                'Type': 'Choice',
+                'Choices': [{
+                    'Condition': '{% $states.input.statusCode = 200 %}',
+                    'Next': 'ValidateQuality'
+                }],
+                'Default': 'ResearchFailed'
+            },
+            'ResearchFailed': {
+                'Type': 'Fail',
+                'Error': 'ResearchFailed',
+                'Cause': 'Research Lambda returned an error'
+            },
+            'ValidateQuality': {
+                'Type': 'Pass',
+                'Output': "{% ($research := $parse($states.input.body); "
+                          "$results := $research.results; "
+                          f"{{'research': $research, 'acceptable': {acceptable}}}) %}}",
+                'Next': 'ShouldGenerateBook'
+            },
+            'ShouldGenerateBook': {
+                'Type': 'Choice',
+                'Choices': [{
+                    'Condition': '{% $request.generate_book and $states.input.acceptable %}',
+                    'Next': 'InvokeBook'
+                }],
+                'Default': 'Done'
+            },
+            'InvokeBook': {
+                'Type': 'Task',
+                'Resource': 'arn:aws:states:::lambda:invoke',
+                'Arguments': {
+                    'FunctionName': book_lambda,
+                    'Payload': {
+                        'body': "{% $string({'topic': $request.topic, "
+                                "'research_data': $states.input.research.results, "
+                                "'book_title': 'Comprehensive Guide to ' & $request.topic, "
+                                "'user_id': $request.user_id}) %}"
+                    }
+                },
+                'Output': "{% $merge([$states.input, "
+                          "{'book': $parse($states.result.Payload.body)}]) %}",
+                'Catch': [{
+                    'ErrorEquals': ['States.ALL'],
+                    'Output': "{% $merge([$states.input, {'book_error': $states.errorOutput}]) %}",
+                    'Next': 'Done'
+                }],
+                'End': True
+            },
+            'Done': {
+                'Type': 'Succeed'
+            }
+        }
+    }
+
+
 class ProbabilityScorer:
     """
     Advanced probability scoring system for AI-generated content.
@@ -337,6 +1312,12 @@ class ProbabilityScorer:
     multiple factors including content quality, consistency, and specificity.
     """
     
+    # Worker processes for calculate_composite_score_batch, created on first use;
+    # _pool_unavailable is set where processes can't be started (e.g. Lambda)
+    _executor: Optional[ProcessPoolExecutor] = None
+    _executor_lock = threading.Lock()
+    _pool_unavailable = False
+    
     @staticmethod
     def calculate_composite_score(
         content: str,
@@ -366,15 +1347,10 @@ class ProbabilityScorer:
         }
         
         # Weighted composite score
-        weights = {
-            'content_quality': 0.5,
-            'source_reliability': 0.3,
-            'context_fit': 0.2
-        }
-        
-        composite = sum(
-            scores[key] * weights[key]
-            for key in scores
+        composite = (
+            scores['content_quality'] * 0.5 +
+            scores['source_reliability'] * 0.3 +
+            scores['context_fit'] * 0.2
         )
         
         return {
@@ -383,11 +1359,66 @@ class ProbabilityScorer:
             'confidence_level': ProbabilityScorer._get_confidence_level(composite)
         }
     
+    @staticmethod
+    def calculate_composite_score_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Calculate composite scores for many items.
+        
+        Scoring is CPU-bound string scanning, so large batches are spread
+        across a shared process pool to sidestep the GIL. Batches below
+        SCORING_PARALLEL_THRESHOLD, or runs where no pool can be started,
+        are scored in the calling process.
+        
+        Args:
+            items: Dicts with 'content', 'source' and optional 'context' keys
+        
+        Returns:
+            Scoring breakdowns in the same order as items
+        """
+        contents = [item['content'] for item in items]
+        sources = [item['source'] for item in items]
+        contexts = [item.get('context') or {} for item in items]
+        
+        workers = os.cpu_count() or 1
+        executor = None
+        if len(items) >= SCORING_PARALLEL_THRESHOLD:
+            executor = ProbabilityScorer._get_executor(workers)
+        
+        if executor is None:
+            return list(map(ProbabilityScorer.calculate_composite_score, contents, sources, contexts))
+        
+        return list(executor.map(
+            ProbabilityScorer.calculate_composite_score,
+            contents, sources, contexts,
+            chunksize=max(1, len(items) // (4 * workers))
+        ))
+    
+    @classmethod
+    def _get_executor(cls, workers: int) -> Optional[ProcessPoolExecutor]:
+        """
+        Return the shared scoring pool, starting it on first use.
+        
+        Workers are spawned rather than forked, since forking a process
+        that runs the batcher, warmer and history threads can deadlock on
+        locks held at fork time. Returns None when a pool can't be created,
+        e.g. on Lambda, which has no /dev/shm for multiprocessing semaphores.
+        """
+        with cls._executor_lock:
+            if cls._executor is None and not cls._pool_unavailable:
+                try:
+                    cls._executor = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                    atexit.register(cls._executor.shutdown)
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"Scoring process pool unavailable, scoring in-process: {e}")
+                    cls._pool_unavailable = True
+            return cls._executor
+    
     @staticmethod
     def _score_content_quality(content: str) -> float:
         """Score based on content characteristics."""
-        import re
-        
         score = 70.0  # Base score
         
         # Length scoring
@@ -398,12 +1429,12 @@ class ProbabilityScorer:
             score += 5
         
         # Structure scoring (paragraphs, sentences)
-        sentences = len([s for s in content.split('.') if s.strip()])
+        sentences = sum(1 for s in content.split('.') if s.strip())
         if sentences >= 3:
             score += 5
         
         # Specificity scoring (numbers, dates, specifics)
-        has_numbers = bool(re.search(r'\d+', content))
+        has_numbers = _DIGIT_RE.search(content) is not None
         has_percentages = '%' in content
         if has_numbers:
             score += 5
@@ -415,12 +1446,7 @@ class ProbabilityScorer:
     @staticmethod
     def _score_source(source: str) -> float:
         """Score based on source model reliability."""
-        source_scores = {
-            'bedrock': 95.0,  # AWS Bedrock is highly reliable
-            'groq': 88.0,     # Groq is fast and good
-            'fallback': 70.0  # Fallback content
-        }
-        return source_scores.get(source, 75.0)
+        return _SOURCE_SCORES.get(source, 75.0)
     
     @staticmethod
     def _score_context_fit(content: str, context: Dict[str, Any]) -> float:
@@ -428,8 +1454,8 @@ class ProbabilityScorer:
         score = 80.0  # Base score
         
         # Check if topic appears in content
-        topic = context.get('topic', '').lower()
-        if topic and topic in content.lower():
+        topic = context.get('topic', '')
+        if topic and _lower_topic(topic) in content.lower():
             score += 10
         
         return min(score, 100.0)
@@ -447,6 +1473,70 @@ class ProbabilityScorer:
             return 'Low'
 
 
+def parse_invoke_response(response: Dict[str, Any]) -> Tuple[int, Any]:
+    """
+    Decode a synchronous Lambda invoke response from an API Gateway-style handler.
+    
+    The payload is parsed straight from the bytes read off the stream.
+    Requests sent with inline_body get the body back as an object; a body
+    string (API Gateway format, or an older deployment) is popped before
+    it is parsed so the raw JSON and the parsed research are not both held
+    for the life of the call.
+    
+    Args:
+        response: Lambda client invoke response
+    
+    Returns:
+        (statusCode, parsed body) tuple
+    
+    Raises:
+        RuntimeError: If the function raised or timed out
+    """
+    # Unhandled errors and timeouts come back as an error payload, not a response
+    if response.get('FunctionError'):
+        error = json_loads(response['Payload'].read())
+        raise RuntimeError(f"{response['FunctionError']} error: {error.get('errorMessage', 'unknown')}")
+    
+    result = json_loads(response['Payload'].read())
+    return result['statusCode'], decode_body(result.pop('body'))
+
+
+def decode_body(body: Any) -> Any:
+    """Return a handler response body as an object, parsing it if it is a JSON string."""
+    return json_loads(body) if isinstance(body, str) else body
+
+
+def new_workflow_id(user_id: str) -> str:
+    """
+    Build a unique workflow ID for a user.
+    
+    The epoch-second prefix keeps a user's IDs roughly time-ordered; the
+    random suffix keeps workflows started in the same second (e.g. by
+    process_research_requests) from sharing an ID.
+    """
+    return f"{user_id}_{time.time_ns() // 1_000_000_000}_{uuid.uuid4().hex[:12]}"
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to compact UTF-8 JSON bytes.
+    
+    Uses orjson when available, which is several times faster than the
+    stdlib encoder on large research payloads and produces bytes that
+    boto3 accepts as a Lambda Payload as-is.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def json_loads(data: Any) -> Any:
+    """Parse a JSON document from bytes or str, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 # Main execution example
 if __name__ == '__main__':
     # Example usage of the orchestrator